@@ -1,21 +1,69 @@
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, APIRouter
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, APIRouter, Request
+from fastapi.responses import JSONResponse, RedirectResponse, PlainTextResponse, Response
+from contextlib import asynccontextmanager
+from pydantic import ValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from typing import List, Dict
 import asyncio
-import json
-import uuid
 from loguru import logger
 
 from src.room import rooms, GameRoom
 from src.broadcast_message import default_messages, DefaultMessage
 from src.player import Player
-from src.config import DEFAULT_PLAYER_IMAGE
-from src.event_handler import event_handlers
-from src.joining_room import validate_room, identify
-from src.request_types import CreateRoomRequest
+from src.config import DEFAULT_PLAYER_IMAGE, WORKER_INDEX
+from src.event_handler import event_decoder, dispatch
+from src.joining_room import validate_room, identify, refuse, receive_frame
+from src.request_types import CreateRoomRequest, IdentifyPayload, RoomStatusBatchRequest
+from src.game_types import RoomStatus
+from src.room_registry import room_registry, RegistryUnavailable
+from src.sharding import is_local, owner_of, worker_url, new_room_id
+from src.metrics import render_metrics, OPEN_CONNECTIONS
+from src.word_generator import word_bank
+from src.room_lifecycle import room_reaper
+from src.room_store import RoomStore
+from src.config import ROOM_SNAPSHOT_INTERVAL_SECONDS
+from src.admission import InboundLimiter, room_refusal, join_refusal, reject
+from src.heartbeat import heartbeat
+from src.logs import configure_logging
+from src.room_status import status_board, INVALID_SUMMARY
+from src.config import STATUS_WATCH_MAX_SECONDS
+from src.broadcast_message import BroadcastMessage
+from src.events import Event
 
-app = FastAPI()
+configure_logging()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Rooms this worker owned before a restart are gone; free their IDs
+    room_registry.forget_worker(WORKER_INDEX)
+    
+    store = RoomStore() if ROOM_SNAPSHOT_INTERVAL_SECONDS > 0 else None
+    if store:
+        store.restore()
+        checkpointer = asyncio.create_task(store.run())
+    
+    reaper = asyncio.create_task(room_reaper.run())
+    flusher = asyncio.create_task(room_registry.run())
+    pinger = asyncio.create_task(heartbeat.run()) if heartbeat.enabled else None
+    
+    yield
+    
+    reaper.cancel()
+    flusher.cancel()
+    room_registry.flush()
+    if pinger:
+        pinger.cancel()
+    
+    if store:
+        checkpointer.cancel()
+        # Whatever changed since the last tick, so the next process can pick it up
+        await store.checkpoint()
+        store.close()
+    
+    # Records still queued for the writer thread
+    await logger.complete()
+
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -26,77 +74,187 @@ app.add_middleware(
 )
 
 @app.get("/room-status/{room_id}")
-async def get_room_status(room_id: str):
-    room = rooms.get(room_id, None)
+async def get_room_status(room_id: str, request: Request, wait: float = 0):
+    if not is_local(room_id):
+        return remote_room_status(room_id, request)
+    
+    # Conditional GET on the summary's ETag; with `wait` it becomes a long poll that
+    # answers as soon as the room changes, or with 304 once the wait is over
+    etag = request.headers.get("if-none-match")
+    summary = status_board.get(room_id)
+    
+    if etag and wait > 0:
+        summary = await status_board.wait(room_id, etag, min(wait, STATUS_WATCH_MAX_SECONDS))
+    
+    # Unknown rooms never match, or a watcher would be answered 304 straight away in a loop
+    if etag == summary.etag and summary is not INVALID_SUMMARY:
+        return Response(status_code=304, headers={"ETag": summary.etag})
     
-    if not room:
-        return JSONResponse(content={"status" : "INVALID"})
+    return Response(summary.body, media_type="application/json", headers={"ETag": summary.etag})
+
+@app.post("/room-status")
+async def get_room_statuses(request: RoomStatusBatchRequest):
+    rooms_found = {}
+    
+    for room_id, summary in status_board.many(request.room_ids).items():
+        if summary:
+            rooms_found[room_id] = summary.data
+        elif is_local(room_id) or owner_of(room_id) is None:
+            rooms_found[room_id] = status_board.get(room_id).data
+        else:
+            # Another worker's room: only its owner has the full summary, the shared
+            # registry (if any) just its status
+            status = (room_registry.status(room_id) or RoomStatus.INVALID) if room_registry.shared else None
+            rooms_found[room_id] = {"status": status, "url": worker_url(owner_of(room_id)) + f"/room-status/{room_id}"}
+    
+    return JSONResponse(content={"rooms": rooms_found})
+
+def remote_room_status(room_id: str, request: Request):
+    owner = owner_of(room_id)
+    
+    if owner is None:
+        return Response(INVALID_SUMMARY.body, media_type="application/json", headers={"ETag": INVALID_SUMMARY.etag})
     
-    if room.is_started:
-        return JSONResponse(content={"status" : "STARTED"})
+    # Only the owner has the summary, its ETag and the watchers to wake, so even with a
+    # shared registry the request goes there, `wait` and all
+    url = worker_url(owner) + request.url.path
+    if request.url.query:
+        url += "?" + request.url.query
     
-    return JSONResponse(content={"status" : "WAITING"})
+    return RedirectResponse(url, status_code=307)
 
 @app.post("/create-room")
 async def create_room(request: CreateRoomRequest):
-    room_id = str(uuid.uuid4())[:6]  # short unique room ID
-    if room_id in rooms:
-        # Extremely rare chance, but regenerate if conflict
-        room_id = str(uuid.uuid4())[:6]
+    refusal = room_refusal(len(rooms))
+    if refusal:
+        content = reject(refusal)
+        return JSONResponse(status_code=503, content=content, headers={"Retry-After": str(content["retry_after"])})
+    
+    try:
+        words = word_bank.cursor(request.deck, request.category)
+    except KeyError as e:
+        return JSONResponse(status_code=400, content={"error": e.args[0]})
+    
+    try:
+        room_id = new_room_id()
+    except RegistryUnavailable as e:
+        logger.warning("Room registry busy, turning away a room creation: {}", e)
+        content = reject("registry_busy")
+        return JSONResponse(status_code=503, content=content, headers={"Retry-After": str(content["retry_after"])})
 
-    new_room = GameRoom(room_id, number_of_rounds=request.numberOfRounds)
-    rooms[room_id] = new_room
-    logger.info(f"Created new room: {room_id}")
+    new_room = GameRoom(room_id, number_of_rounds=request.numberOfRounds, words=words)
+    room_reaper.open_room(new_room)
+    logger.info("Created new room: {}", room_id)
 
     return JSONResponse(content={"room_id": room_id})
 
+@app.get("/decks")
+async def get_decks():
+    return JSONResponse(content=word_bank.catalog())
+
+@app.get("/metrics")
+async def get_metrics():
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
 @app.websocket("/ws/game/{room_id}")
 async def websocket_endpoint(websocket: WebSocket, room_id: str):
     await websocket.accept()
+    OPEN_CONNECTIONS.inc()
     
+    try:
+        await play(websocket, room_id)
+    finally:
+        OPEN_CONNECTIONS.dec()
+        
+async def play(websocket: WebSocket, room_id: str):
     room_validated = await validate_room(websocket, room_id)
     if not room_validated:
         return
 
     room = rooms[room_id]
-    player = await identify(websocket)
-    if not player:
+    identified = await identify(websocket)
+    if not identified:
         return
 
-    room.add_player(player)
-    logger.info(f"Players in room: {room.players.keys()}")
-    await room.send_updated_player_list()
-    await room.notify_player_who_joined(player)
+    player, hello = identified
+    if hello.spectate:
+        await spectate(websocket, room, hello)
+        return
+    
+    resumed = None
+    if hello.resume_token:
+        resumed = await room.call(room.resume, websocket, hello.resume_token, hello.last_seq, hello.encoding)
 
-    try:
-        while True:
-            message_json = await websocket.receive_text()
-            message = json.loads(message_json)
-            event = message.get('event')
-            data = message.get('data', {})
-
-            if event in event_handlers:
-                await event_handlers[event](websocket, data, room, player)
-            else:
-                logger.info(f"Unknown event: {event}")
-                logger.info(message)
-    except WebSocketDisconnect:
-        logger.info(f"WebSocket disconnected: {player.player_id}")
-        disconnected_player = room.remove_player(websocket)
+    if resumed:
+        player = resumed
+    else:
+        refusal = join_refusal()
+        if refusal is None and not await room.call(room.join, player, websocket, hello.encoding):
+            refusal = "room_full"
         
-        await room.send_updated_player_list()
-        
-        if len(room.players.keys()) == 0:
-            rooms.pop(room.room_id)
+        if refusal:
+            room.log.info("Turned away {} from room {}: {}", player.player_id, room_id, refusal)
+            await refuse(websocket, refusal)
+            return
+
+    limiter = InboundLimiter()
+    queue = room.outbound.get(player.player_id)
+    slot = heartbeat.register(room, queue) if hello.heartbeat and heartbeat.enabled and queue else None
+    
+    try:
+        while websocket in room.connections:
+            frame = await receive_frame(websocket)
+            if slot is not None:
+                heartbeat.seen(slot, queue)
+            
+            try:
+                message = event_decoder.decode(frame)
+            except ValidationError as e:
+                if not limiter.allow(None):
+                    continue
+                
+                room.log.info("Rejected frame from {}: {} errors", player.player_id, e.error_count())
+                room.post(room.send_to_player, player, default_messages[DefaultMessage.INVALID_MESSAGE])
+                continue
             
-            logger.info("Empty Room. Deleting Room")
+            if message.event == Event.PONG:
+                continue
+            
+            # Dropped before it reaches the room, so a flood never turns into broadcasts
+            if not limiter.allow(message.event):
+                if limiter.should_notify():
+                    notice = {"event": message.event, "retry_after": round(limiter.retry_after(message.event), 3)}
+                    room.post(room.send_to_player, player, BroadcastMessage(Event.RATE_LIMITED, notice, sequenced=False))
+                continue
+
+            # Decoding above runs per connection; applying the event is serialized per room
+            await room.call(dispatch, message, websocket, room, player)
+    except WebSocketDisconnect:
+        room.log.info("WebSocket disconnected: {}", player.player_id)
+        await room.call(room.disconnect, websocket)
         
     except Exception as e:
-        logger.exception(f"Unexpected error for player {player.player_id}: {e}")
-        disconnected_player = room.remove_player(websocket)
+        logger.exception("Unexpected error for player {}: {}", player.player_id, e)
+        await room.call(room.disconnect, websocket)
         
-        await room.send_updated_player_list()
-        
-        if len(room.players.keys()) == 0:
-            rooms.pop(room.room_id)
-            logger.info("Empty Room. Deleting Room")
\ No newline at end of file
+    finally:
+        if slot is not None:
+            heartbeat.forget(slot, queue)
+
+async def spectate(websocket: WebSocket, room: GameRoom, hello: IdentifyPayload):
+    refusal = join_refusal()
+    if refusal is None and not await room.call(room.add_spectator, websocket, hello.encoding):
+        refusal = "too_many_spectators"
+    
+    if refusal:
+        await refuse(websocket, refusal)
+        return
+    
+    try:
+        # Read-only: whatever a spectator sends is dropped unread until it goes away
+        while websocket in room.spectators.queues:
+            await receive_frame(websocket)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        room.post(room.remove_spectator, websocket)
\ No newline at end of file
@@ -0,0 +1,86 @@
+"""
+Encode cost per broadcast as the room grows.
+
+Compares the old per-recipient `json.dumps` against the cached
+`BroadcastMessage.frame` used by `GameRoom.send_to_all_players`.
+
+    python -m benchmarks.broadcast_fanout
+"""
+import asyncio
+import json
+import time
+from unittest import mock
+
+from src.room import GameRoom
+from src.player import Player
+from src.broadcast_message import BroadcastMessage
+from src.events import Event
+
+ROOM_SIZES = [2, 8, 32, 128, 512]
+BROADCASTS = 200
+
+class NullSocket:
+    async def send_text(self, frame: str):
+        pass
+
+def make_room(size: int) -> GameRoom:
+    room = GameRoom("bench")
+
+    for i in range(size):
+        room.add_player(Player(player_id=f"player-{i}",
+                               player_name=f"Player {i}",
+                               player_image_url="https://example.com/image.png"),
+                        NullSocket())
+
+    return room
+
+def make_message(room: GameRoom) -> BroadcastMessage:
+    players = [player.to_dict() for player in room.players.values()]
+
+    return BroadcastMessage(Event.UPDATED_PLAYERS_LIST, {"players": players})
+
+async def per_recipient(room: GameRoom):
+    # The previous behaviour: every recipient encodes the payload again
+    message = make_message(room)
+    await asyncio.gather(*(queue.websocket.send_text(json.dumps(message.to_dict()))
+                           for queue in room.outbound.values()))
+
+async def serialize_once(room: GameRoom):
+    await room.send_to_all_players(make_message(room))
+
+async def measure(room: GameRoom, broadcast) -> tuple:
+    dumps = json.dumps
+    encode_time = 0.0
+    encode_calls = 0
+
+    def timed_dumps(*args, **kwargs):
+        nonlocal encode_time, encode_calls
+        start = time.perf_counter()
+        result = dumps(*args, **kwargs)
+        encode_time += time.perf_counter() - start
+        encode_calls += 1
+        return result
+
+    with mock.patch("json.dumps", timed_dumps), mock.patch("src.room.logger"):
+        start = time.perf_counter()
+        for _ in range(BROADCASTS):
+            await broadcast(room)
+        total = time.perf_counter() - start
+
+    return encode_calls / BROADCASTS, encode_time / BROADCASTS, total / BROADCASTS
+
+async def main():
+    print(f"{'players':>8} {'path':>15} {'encodes':>8} {'encode us':>10} {'total us':>10}")
+
+    for size in ROOM_SIZES:
+        room = make_room(size)
+
+        for name, broadcast in (("per-recipient", per_recipient), ("serialize-once", serialize_once)):
+            calls, encode, total = await measure(room, broadcast)
+            print(f"{size:>8} {name:>15} {calls:>8.0f} {encode * 1e6:>10.1f} {total * 1e6:>10.1f}")
+
+        for websocket in list(room.connections):
+            room.remove_player(websocket)
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,62 @@
+"""
+Outbound frames per client during lobby churn, with and without tick coalescing.
+
+Every player in the room renames itself and toggles ready a few times within a few
+milliseconds, like a lobby filling up; the room either broadcasts after each event
+or merges them into one patch per tick (STATE_FLUSH_TICK_SECONDS).
+
+    python -m benchmarks.coalescing
+"""
+import asyncio
+
+from src.room import GameRoom
+from src.player import Player
+
+ROOM_SIZES = [4, 8, 16]
+TOGGLES = 5
+TICK_SECONDS = 0.03
+
+class CountingSocket:
+    def __init__(self):
+        self.frames = 0
+
+    async def send_text(self, frame: str):
+        self.frames += 1
+
+async def churn(size: int, flush_tick: float) -> float:
+    room = GameRoom("bench", flush_tick=flush_tick)
+    sockets = [CountingSocket() for _ in range(size)]
+
+    for i, socket in enumerate(sockets):
+        room.add_player(Player(player_id=f"player-{i}", player_name=f"Player {i}", player_image_url=""), socket)
+
+    await room.flush_player_list()
+    await asyncio.sleep(0.01)
+    before = sum(socket.frames for socket in sockets)
+
+    for toggle in range(TOGGLES):
+        for i in range(size):
+            room.set_name(f"player-{i}", f"Player {i} #{toggle}")
+            await room.send_updated_player_list()
+            room.set_ready(f"player-{i}") if toggle % 2 == 0 else room.unready(f"player-{i}")
+            await room.send_updated_player_list()
+        await asyncio.sleep(0.002)
+
+    await asyncio.sleep(flush_tick + 0.05)
+    frames = sum(socket.frames for socket in sockets) - before
+
+    for websocket in list(room.connections):
+        room.remove_player(websocket)
+
+    return frames / size
+
+async def main():
+    print(f"{'players':>8} {'events':>7} {'frames/client off':>18} {'frames/client tick':>19}")
+
+    for size in ROOM_SIZES:
+        off = await churn(size, 0)
+        on = await churn(size, TICK_SECONDS)
+        print(f"{size:>8} {size * TOGGLES * 2:>7} {off:>18.1f} {on:>19.1f}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
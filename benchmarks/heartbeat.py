@@ -0,0 +1,115 @@
+"""
+Cost of the heartbeat sweeper at up to 100k connections.
+
+Every connection has a real outbound queue in front of a socket that accepts frames
+instantly. Reports, per sweep: the time the sweep itself spent on the event loop, the
+longest single stall of the loop while it ran, and how long it took every queue to
+hand its ping to the socket. A second sweep lets 1% of the connections go silent, so
+the eviction path is measured as well. Also reports the memory held by the sweeper's
+own tracking arrays.
+
+    python -m benchmarks.heartbeat
+    python -m benchmarks.heartbeat --connections 10000
+"""
+import argparse
+import asyncio
+import gc
+import sys
+import time
+from unittest import mock
+
+from src.heartbeat import Heartbeat
+from src.outbound_queue import OutboundQueue
+from src.wire_format import WireFormat
+
+class StubSocket:
+    def __init__(self):
+        self.sent = 0
+
+    async def send_text(self, frame: str):
+        self.sent += 1
+
+    async def send_bytes(self, frame: bytes):
+        self.sent += 1
+
+class StubRoom:
+    def __init__(self):
+        self.posted = 0
+
+    def post(self, job, *args):
+        self.posted += 1
+
+async def watch_stalls(stalls: list):
+    # Only the longest gap is kept; a growing list of every gap would stall the loop itself
+    loop = asyncio.get_running_loop()
+    last = loop.time()
+
+    while True:
+        await asyncio.sleep(0)
+        now = loop.time()
+        stalls[0] = max(stalls[0], now - last)
+        last = now
+
+async def sweep(heartbeat: Heartbeat, sockets: list, silent: int = 0):
+    stalls = [0.0]
+    watcher = asyncio.create_task(watch_stalls(stalls))
+    await asyncio.sleep(0)
+
+    # Connections found silent are released during the sweep and get no ping
+    expected = sum(socket.sent for socket in sockets) + heartbeat.tracked - silent
+
+    with mock.patch("src.heartbeat.SWEEP_SECONDS") as histogram:
+        start = time.perf_counter()
+        await heartbeat.sweep()
+        on_loop = histogram.observe.call_args[0][0]
+
+    watcher.cancel()
+    while sum(socket.sent for socket in sockets) < expected:
+        await asyncio.sleep(0.01)
+    delivered = time.perf_counter() - start
+
+    return on_loop, stalls[0], delivered
+
+def tracking_bytes(heartbeat: Heartbeat) -> int:
+    return sys.getsizeof(heartbeat.last_seen) + sys.getsizeof(heartbeat.queues) + sys.getsizeof(heartbeat.rooms)
+
+async def main(args):
+    heartbeat = Heartbeat(interval=args.interval, timeout=args.interval * 3)
+    room = StubRoom()
+    sockets, queues = [], []
+
+    start = time.perf_counter()
+    for index in range(args.connections):
+        socket = StubSocket()
+        queue = OutboundQueue(socket, lambda websocket: None, WireFormat.JSON if index % 2 else WireFormat.MSGPACK)
+        sockets.append(socket)
+        queues.append(queue)
+        heartbeat.register(room, queue)
+    registered = time.perf_counter() - start
+    # Everything above lives as long as the server would; keep full collections of it out of the stalls
+    gc.freeze()
+
+    print(f"connections: {args.connections}, register {registered / args.connections * 1e6:.2f} us each, "
+          f"tracking {tracking_bytes(heartbeat) / 1e6:.2f} MB")
+    print(f"{'sweep':>10} {'on loop ms':>11} {'max stall ms':>13} {'pings delivered ms':>19} {'evicted':>8}")
+
+    on_loop, stall, delivered = await sweep(heartbeat, sockets)
+    print(f"{'all alive':>10} {on_loop * 1000:>11.1f} {stall * 1000:>13.1f} {delivered * 1000:>19.1f} {room.posted:>8}")
+
+    for slot in range(0, args.connections, 100):
+        heartbeat.last_seen[slot] -= 60
+    with mock.patch("src.heartbeat.UNRESPONSIVE_EVICTED"):
+        on_loop, stall, delivered = await sweep(heartbeat, sockets, len(range(0, args.connections, 100)))
+    print(f"{'1% silent':>10} {on_loop * 1000:>11.1f} {stall * 1000:>13.1f} {delivered * 1000:>19.1f} {room.posted:>8}")
+
+    for queue in queues:
+        queue.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--connections", type=int, default=100_000)
+    parser.add_argument("--interval", type=float, default=2.0, help="heartbeat interval; a sweep is paced over half of it")
+    args = parser.parse_args()
+
+    with mock.patch("src.outbound_queue.logger"):
+        asyncio.run(main(args))
@@ -0,0 +1,69 @@
+"""
+Startup cost of the word decks and name parts, each run in a fresh interpreter.
+
+"json" reproduces what importing word_generator and name_generator used to do (parse
+the JSON, build a WordClue per entry, read both name lists), here for the classic and
+the 670KB extended deck. "compiled" opens the memory-mapped assets from
+src.static_assets and does one draw from each.
+
+    python -m src.static_assets && python -m benchmarks.import_time
+"""
+import statistics
+import subprocess
+import sys
+
+RUNS = 10
+
+PRELUDE = """
+import resource, time
+import pydantic
+start = time.perf_counter()
+"""
+
+JSON_LOAD = """
+import json
+from src.config import STATIC_DIR
+from src.game_types import WordClue
+decks = {}
+for name in ("word_list.json", "words_and_clues.json"):
+    with open(STATIC_DIR / name, "r") as file:
+        decks[name] = [WordClue(word=entry["word"], clue=entry["clue"]) for entry in json.load(file)["words"]]
+with open(STATIC_DIR / "adjectives.txt", "r") as file:
+    adjectives = [word.strip() for word in file.readlines()]
+with open(STATIC_DIR / "nouns.txt", "r") as file:
+    nouns = [word.strip() for word in file.readlines()]
+"""
+
+COMPILED_LOAD = """
+from src.word_generator import word_bank
+from src.name_generator import generate_random_name
+word_bank.cursor("classic").draw()
+word_bank.cursor("extended").draw()
+generate_random_name()
+"""
+
+REPORT = """
+elapsed = time.perf_counter() - start
+print(elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+def measure(body: str):
+    elapsed, rss = [], []
+
+    for _ in range(RUNS):
+        output = subprocess.run([sys.executable, "-c", PRELUDE + body + REPORT],
+                                capture_output=True, text=True, check=True).stdout.split()
+        elapsed.append(float(output[0]))
+        rss.append(int(output[1]))
+
+    return statistics.median(elapsed), statistics.median(rss)
+
+def main():
+    print(f"{'loader':>10} {'load ms':>10} {'max rss KB':>12}")
+
+    for name, body in (("json", JSON_LOAD), ("compiled", COMPILED_LOAD)):
+        elapsed, rss = measure(body)
+        print(f"{name:>10} {elapsed * 1000:>10.2f} {rss:>12}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Inbound frame throughput: the old `json.loads` + dict lookup + `data.get` loop against
+the compiled `EventDecoder` used by `websocket_endpoint`.
+
+    python -m benchmarks.inbound_decoding
+"""
+import json
+import time
+
+from src.event_handler import event_decoder, event_handlers
+from src.events import Event
+
+FRAMES = [
+    json.dumps({"event": Event.SET_READY, "data": {}}),
+    json.dumps({"event": Event.SET_NAME, "data": {"new_name": "Swift Aardvark"}}),
+    json.dumps({"event": Event.SET_IMAGE, "data": {"player_image_url": "https://example.com/image.png"}}),
+    json.dumps({"event": Event.SET_VOTE, "data": {"voted": "2b1f0c9e-6a8d-4d0e-9a51-3f1c1e6a9b2d"}}),
+    json.dumps({"event": Event.END_TURN}),
+]
+MALFORMED = [
+    "not json",
+    json.dumps({"event": "unknown_event", "data": {}}),
+    json.dumps({"event": Event.SET_VOTE, "data": {"voted": 5}}),
+]
+ROUNDS = 100_000
+
+FIELDS = {
+    Event.SET_NAME: "new_name",
+    Event.SET_IMAGE: "player_image_url",
+    Event.SET_VOTE: "voted",
+}
+
+def current_loop(frame: str):
+    # What the receive loop and handlers did before: decode, look up, then dig through the dict
+    try:
+        message = json.loads(frame)
+    except ValueError:
+        return None
+
+    event = message.get('event')
+    data = message.get('data', {})
+
+    if event not in event_handlers:
+        return None
+
+    field = FIELDS.get(event)
+    return data.get(field) if field else data
+
+def compiled_decoder(frame: str):
+    try:
+        return event_decoder.decode(frame)
+    except ValueError:
+        return None
+
+def run(decode, frames) -> float:
+    start = time.perf_counter()
+
+    for _ in range(ROUNDS // len(frames)):
+        for frame in frames:
+            decode(frame)
+
+    return ROUNDS / (time.perf_counter() - start)
+
+def main():
+    event_decoder.decode(FRAMES[0])
+
+    print(f"{'frames':>10} {'path':>17} {'frames/s':>12}")
+    for label, frames in (("valid", FRAMES), ("malformed", MALFORMED)):
+        for name, decode in (("json.loads loop", current_loop), ("compiled decoder", compiled_decoder)):
+            print(f"{label:>10} {name:>17} {run(decode, frames):>12,.0f}")
+
+if __name__ == "__main__":
+    main()
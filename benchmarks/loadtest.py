@@ -0,0 +1,277 @@
+"""
+End-to-end load test: creates rooms over HTTP and plays full games over websockets.
+
+Each room is driven one step at a time (identify, set_ready, countdown, end_turn
+rotation, set_vote), so every step's latency is measured from the moment the event is
+sent until the resulting broadcast has reached every client in the room. Results are
+printed, or written with --output, as JSON so runs can be compared across commits.
+
+    python -m benchmarks.loadtest --spawn --rooms 200 --players 6 --concurrency 50
+    python -m benchmarks.loadtest --url http://127.0.0.1:8000 --output results.json
+    python -m benchmarks.loadtest --spawn --encoding msgpack
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+import urllib.request
+from collections import Counter, defaultdict
+from typing import Dict, List
+
+import msgpack
+import websockets
+
+from src.events import Event
+from src.wire_format import WireFormat, EVENT_CODES, decode_binary_frame
+
+class SimClient:
+    def __init__(self, room: "SimRoom", url: str, encoding: WireFormat):
+        self.room = room
+        self.url = url
+        self.encoding = encoding
+        self.websocket = None
+        self.player_id = None
+        self.received: Counter = Counter()
+        self.arrivals: Dict[str, List[float]] = defaultdict(list)
+        self.updated = asyncio.Condition()
+        self.reader = None
+
+    async def connect(self, name: str):
+        self.websocket = await websockets.connect(self.url, max_queue=None)
+        # The handshake itself is always JSON
+        await self.websocket.send(json.dumps({"event": Event.IDENTIFY, "data": {"player_name": name, "encoding": self.encoding}}))
+        self.room.stats.frames_out += 1
+        self.reader = asyncio.create_task(self.read())
+        await self.wait(Event.PLAYER_JOINED, 1)
+
+    async def send(self, event: str, data: Dict = None):
+        self.room.stats.frames_out += 1
+
+        if self.encoding == WireFormat.MSGPACK:
+            await self.websocket.send(msgpack.packb([EVENT_CODES[event], data or {}]))
+        else:
+            await self.websocket.send(json.dumps({"event": event, "data": data or {}}))
+
+    async def read(self):
+        try:
+            async for frame in self.websocket:
+                now = time.perf_counter()
+                message = decode_binary_frame(frame) if isinstance(frame, bytes) else json.loads(frame)
+                event = message["event"]
+
+                self.room.stats.frames_in += 1
+                self.room.stats.bytes_in += len(frame)
+
+                if event == Event.PLAYER_JOINED:
+                    self.player_id = message["data"]["current_player"]["player_id"]
+                elif event == Event.START_TURN:
+                    self.room.turns.put_nowait(self)
+
+                async with self.updated:
+                    self.received[event] += 1
+                    self.arrivals[event].append(now)
+                    self.updated.notify_all()
+        except websockets.ConnectionClosed:
+            pass
+
+    async def wait(self, event: str, count: int) -> float:
+        async with self.updated:
+            await self.updated.wait_for(lambda: self.received[event] >= count)
+
+        return self.arrivals[event][count - 1]
+
+    async def close(self):
+        await self.websocket.close()
+        if self.reader:
+            await self.reader
+
+class Stats:
+    def __init__(self):
+        self.frames_in = 0
+        self.frames_out = 0
+        self.bytes_in = 0
+        self.rooms_created = 0
+        self.games_completed = 0
+        self.errors = 0
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+
+class SimRoom:
+    def __init__(self, base_url: str, players: int, rounds: int, encoding: WireFormat, stats: Stats):
+        self.base_url = base_url
+        self.encoding = encoding
+        self.players = players
+        self.rounds = rounds
+        self.stats = stats
+        self.clients: List[SimClient] = []
+        self.turns: asyncio.Queue = asyncio.Queue()
+
+    async def create(self) -> str:
+        def post():
+            request = urllib.request.Request(f"{self.base_url}/create-room",
+                                             data=json.dumps({"numberOfRounds": self.rounds}).encode(),
+                                             headers={"Content-Type": "application/json"})
+            with urllib.request.urlopen(request) as response:
+                return json.load(response)["room_id"]
+
+        room_id = await asyncio.to_thread(post)
+        self.stats.rooms_created += 1
+        return room_id
+
+    async def step(self, sender: SimClient, event: str, data: Dict, expect: str):
+        # Every client must see one more `expect` frame than before the event was sent
+        targets = [client.received[expect] + 1 for client in self.clients]
+        sent = time.perf_counter()
+        await sender.send(event, data)
+
+        arrivals = await asyncio.gather(*(client.wait(expect, target)
+                                          for client, target in zip(self.clients, targets)))
+        self.stats.latencies[event].append(max(arrivals) - sent)
+
+    async def play(self):
+        room_id = await self.create()
+        ws_url = self.base_url.replace("http", "ws", 1) + f"/ws/game/{room_id}"
+
+        try:
+            for index in range(self.players):
+                client = SimClient(self, ws_url, self.encoding)
+                self.clients.append(client)
+
+                started = time.perf_counter()
+                await client.connect(f"Load {index}")
+                self.stats.latencies[Event.IDENTIFY].append(time.perf_counter() - started)
+
+            for client in self.clients[:-1]:
+                await self.step(client, Event.SET_READY, {}, Event.PLAYERS_PATCH)
+
+            await self.step(self.clients[-1], Event.SET_READY, {}, Event.GAME_START)
+
+            total_turns = self.players * self.rounds
+            for turn in range(total_turns):
+                client = await self.turns.get()
+
+                if turn == total_turns - 1:
+                    await self.step(client, Event.END_TURN, {}, Event.VOTING_START)
+                    continue
+
+                # Only the next player is told it is their turn
+                sent = time.perf_counter()
+                await client.send(Event.END_TURN)
+
+                next_client = await self.turns.get()
+                self.turns.put_nowait(next_client)
+                self.stats.latencies[Event.END_TURN].append(next_client.arrivals[Event.START_TURN][-1] - sent)
+
+            target = self.clients[0].player_id
+            for client in self.clients[:-1]:
+                await self.step(client, Event.SET_VOTE, {"voted": target}, Event.PLAYERS_PATCH)
+
+            await self.step(self.clients[-1], Event.SET_VOTE, {"voted": target}, Event.SHOW_IMPOSTOR)
+            self.stats.games_completed += 1
+        finally:
+            await asyncio.gather(*(client.close() for client in self.clients if client.websocket),
+                                 return_exceptions=True)
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+def summarize(stats: Stats, duration: float, args) -> Dict:
+    latencies = {
+        event: {
+            "count": len(values),
+            "p50_ms": percentile(values, 0.50) * 1000,
+            "p99_ms": percentile(values, 0.99) * 1000,
+            "max_ms": max(values) * 1000,
+        }
+        for event, values in stats.latencies.items() if values
+    }
+
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = None
+
+    return {
+        "commit": commit,
+        "config": {"rooms": args.rooms, "players": args.players, "rounds": args.rounds, "concurrency": args.concurrency,
+                   "encoding": args.encoding},
+        "duration_s": duration,
+        "rooms_created": stats.rooms_created,
+        "games_completed": stats.games_completed,
+        "errors": stats.errors,
+        "rooms_per_s": stats.games_completed / duration,
+        "frames_in_per_s": stats.frames_in / duration,
+        "frames_out_per_s": stats.frames_out / duration,
+        "bytes_per_frame_in": stats.bytes_in / max(stats.frames_in, 1),
+        "latency": latencies,
+    }
+
+async def run(args) -> Dict:
+    stats = Stats()
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def one_room():
+        async with semaphore:
+            try:
+                await SimRoom(args.url, args.players, args.rounds, WireFormat(args.encoding), stats).play()
+            except Exception as e:
+                stats.errors += 1
+                print(f"room failed: {e!r}", file=sys.stderr)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one_room() for _ in range(args.rooms)))
+
+    return summarize(stats, time.perf_counter() - started, args)
+
+def spawn_server(port: int) -> subprocess.Popen:
+    env = dict(os.environ, COUNTDOWN_SECONDS=os.environ.get("COUNTDOWN_SECONDS", "0"))
+    process = subprocess.Popen([sys.executable, "-m", "uvicorn", "app:app", "--port", str(port), "--log-level", "warning"],
+                               env=env, stderr=subprocess.DEVNULL)
+
+    for _ in range(100):
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/room-status/000000")
+            return process
+        except OSError:
+            time.sleep(0.1)
+
+    process.terminate()
+    raise RuntimeError("server did not start")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--rooms", type=int, default=100)
+    parser.add_argument("--players", type=int, default=5)
+    parser.add_argument("--rounds", type=int, default=1)
+    parser.add_argument("--concurrency", type=int, default=20, help="rooms played at the same time")
+    parser.add_argument("--encoding", choices=[wire_format.value for wire_format in WireFormat], default=WireFormat.JSON.value)
+    parser.add_argument("--spawn", action="store_true", help="start a local server with COUNTDOWN_SECONDS=0")
+    parser.add_argument("--port", type=int, default=8765, help="port for --spawn")
+    parser.add_argument("--output", help="write the JSON results to this file")
+    args = parser.parse_args()
+
+    server = None
+    if args.spawn:
+        server = spawn_server(args.port)
+        args.url = f"http://127.0.0.1:{args.port}"
+
+    try:
+        results = asyncio.run(run(args))
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output)
+
+    print(output)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Event-loop throughput with the old per-frame logging next to the sampled pipeline.
+
+Rooms of players keep renaming a player and flushing the player list, so every frame
+goes through `GameRoom.send_frame`, which is where the old code logged at info level.
+"before" gives every room a logger that behaves like the old calls: the message is
+formatted eagerly and written synchronously to a line-buffered file, the way stderr
+feeds a log collector. The other runs use `RoomLogger` with the enqueued sink, at INFO
+(per-frame debug records filtered out) and at DEBUG (sampled and rate limited per room).
+Reports frames per second, the longest stall of the loop and how many records were written.
+
+    python -m benchmarks.logging_overhead
+    python -m benchmarks.logging_overhead --rooms 200 --players 8
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from loguru import logger
+
+from src.room import GameRoom
+from src.player import Player
+from src.logs import RoomLogger, configure_logging
+
+class NullSocket:
+    async def send_text(self, frame: str):
+        pass
+
+    async def send_bytes(self, frame: bytes):
+        pass
+
+class LegacyLog:
+    # Every call formatted up front and written at info, like the f-strings it replaced
+    def debug(self, message: str, *args):
+        logger.info(message.format(*args))
+
+    info = warning = debug
+
+def make_room(index: int, players: int) -> GameRoom:
+    room = GameRoom(f"bench-{index}", flush_tick=0)
+
+    for seat in range(players):
+        room.add_player(Player(player_id=f"bench-{index}-{seat}", player_name=f"Player {seat}", player_image_url="https://example.com/p.png"), NullSocket())
+
+    return room
+
+async def play(room: GameRoom, rounds: int):
+    for turn in range(rounds):
+        room.set_name(f"{room.room_id}-0", f"Name {turn}")
+        await room.flush_player_list()
+        await asyncio.sleep(0)
+
+async def watch_stalls(stalls: list):
+    loop = asyncio.get_running_loop()
+    last = loop.time()
+
+    while True:
+        await asyncio.sleep(0)
+        now = loop.time()
+        stalls[0] = max(stalls[0], now - last)
+        last = now
+
+async def run(args, legacy: bool, level: str) -> tuple:
+    path = os.path.join(tempfile.mkdtemp(), "bench.log")
+    sink = open(path, "w", buffering=1)
+    configure_logging(level, enqueue=not legacy, sink=sink)
+
+    rooms = [make_room(index, args.players) for index in range(args.rooms)]
+    for room in rooms:
+        room.log = LegacyLog() if legacy else RoomLogger(room.room_id)
+
+    stalls = [0.0]
+    watcher = asyncio.create_task(watch_stalls(stalls))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(play(room, args.rounds) for room in rooms))
+    elapsed = time.perf_counter() - start
+    watcher.cancel()
+
+    await logger.complete()
+    for room in rooms:
+        for queue in room.outbound.values():
+            queue.close()
+    logger.remove()
+    sink.close()
+
+    with open(path) as log_file:
+        records = sum(1 for _ in log_file)
+
+    frames = args.rooms * args.players * args.rounds
+    return frames / elapsed, stalls[0], records
+
+async def main(args):
+    print(f"{'logging':>14} {'frames/s':>10} {'max stall ms':>13} {'records':>8}")
+
+    for name, legacy, level in (("before", True, "INFO"), ("after, INFO", False, "INFO"), ("after, DEBUG", False, "DEBUG")):
+        throughput, stall, records = await run(args, legacy, level)
+        print(f"{name:>14} {throughput:>10.0f} {stall * 1000:>13.1f} {records:>8}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rooms", type=int, default=100)
+    parser.add_argument("--players", type=int, default=8)
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    asyncio.run(main(args))
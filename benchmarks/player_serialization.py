@@ -0,0 +1,74 @@
+"""
+Cost of building a full player list, as a snapshot broadcast does.
+
+"pydantic" is the previous `Player` model dumped with `model_dump(exclude={"websocket"})`
+on every broadcast; "cached" is the slotted `Player` whose wire dict is rebuilt only after
+one of its fields changes. Each round changes one player, like a set_ready would.
+
+    python -m benchmarks.player_serialization
+"""
+import time
+import tracemalloc
+
+from fastapi import WebSocket
+from pydantic import BaseModel, ConfigDict
+
+from src.player import Player
+
+LOBBY_SIZES = [4, 16, 64, 256]
+ROUNDS = 2000
+
+class PydanticPlayer(BaseModel):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+    player_id : str
+    websocket : WebSocket
+    player_name : str
+    player_image_url : str
+    is_ready: bool
+    turn_ended: bool
+    has_voted: bool
+    currently_discussing: bool
+
+def pydantic_round(players, round_number):
+    players[round_number % len(players)].is_ready = bool(round_number & 1)
+    return [player.model_dump(exclude={"websocket"}) for player in players]
+
+def cached_round(players, round_number):
+    players[round_number % len(players)].set_ready(bool(round_number & 1))
+    return [player.to_dict() for player in players]
+
+def measure(players, build):
+    tracemalloc.start()
+    start = time.perf_counter()
+
+    for round_number in range(ROUNDS):
+        build(players, round_number)
+
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # tracemalloc slows both paths equally; the ratio is what matters
+    return elapsed / ROUNDS, peak
+
+def main():
+    print(f"{'players':>8} {'path':>9} {'us/list':>9} {'peak KB':>9}")
+
+    for size in LOBBY_SIZES:
+        pydantic_players = [
+            PydanticPlayer.model_construct(player_id=f"player-{i}", websocket=None, player_name=f"Player {i}",
+                                           player_image_url="https://example.com/image.png", is_ready=False,
+                                           turn_ended=False, has_voted=False, currently_discussing=False)
+            for i in range(size)
+        ]
+        cached_players = [
+            Player(player_id=f"player-{i}", player_name=f"Player {i}", player_image_url="https://example.com/image.png")
+            for i in range(size)
+        ]
+
+        for name, players, build in (("pydantic", pydantic_players, pydantic_round), ("cached", cached_players, cached_round)):
+            per_list, peak = measure(players, build)
+            print(f"{size:>8} {name:>9} {per_list * 1e6:>9.1f} {peak / 1024:>9.1f}")
+
+if __name__ == "__main__":
+    main()
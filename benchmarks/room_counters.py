@@ -0,0 +1,58 @@
+"""
+Times the room's counter-backed predicates against the previous list-building scans.
+
+`all_ready`, `all_voted` and `all_turns_ended` read running totals; the scans walk every
+player. tests/test_room_counters.py checks the totals against a brute-force recount.
+
+    python -m benchmarks.room_counters
+"""
+import asyncio
+import time
+from unittest import mock
+
+from src.room import GameRoom
+from src.player import Player
+
+ROOM_SIZES = [8, 64, 512, 4096]
+CHECKS = 2000
+
+class NullSocket:
+    async def send_text(self, frame: str):
+        pass
+
+def per_call(function) -> float:
+    start = time.perf_counter()
+    for _ in range(CHECKS):
+        function()
+    return (time.perf_counter() - start) / CHECKS
+
+async def timing():
+    print(f"{'players':>8} {'scan us':>9} {'counter us':>11}")
+
+    for size in ROOM_SIZES:
+        room = GameRoom("bench")
+        for i in range(size):
+            room.add_player(Player(player_id=f"player-{i}", player_name=f"Player {i}", player_image_url=""), NullSocket())
+            room.set_ready(f"player-{i}")
+
+        def scan():
+            all([player.is_ready for player in room.players.values()])
+            all([player.has_voted for player in room.players.values()])
+            all([player.turn_ended for player in room.players.values()])
+
+        def counters():
+            room.all_ready()
+            room.all_voted()
+            room.all_turns_ended()
+
+        print(f"{size:>8} {per_call(scan) * 1e6:>9.2f} {per_call(counters) * 1e6:>11.2f}")
+
+        for websocket in list(room.connections):
+            room.remove_player(websocket)
+
+async def main():
+    with mock.patch("src.room.logger"), mock.patch("src.logs.logger"), mock.patch("src.room.room_registry"):
+        await timing()
+
+if __name__ == "__main__":
+    asyncio.run(main())
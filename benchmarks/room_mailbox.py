@@ -0,0 +1,68 @@
+"""
+Overhead and isolation of the per-room mailbox.
+
+Many connections fire jobs at their rooms at once. Every job yields to the event loop
+halfway through its change, which is where unserialized handlers used to interleave.
+Reports how often two jobs of the same room overlapped, the most jobs in flight at once
+across all rooms (rooms should still progress side by side), and the cost per job next
+to awaiting the same coroutine directly.
+
+    python -m benchmarks.room_mailbox
+"""
+import asyncio
+import time
+
+from src.room_mailbox import RoomMailbox
+
+ROOM_COUNTS = [1, 100, 1000]
+CONNECTIONS_PER_ROOM = 8
+JOBS_PER_CONNECTION = 50
+
+class Stats:
+    def __init__(self, rooms: int):
+        self.running = [0] * rooms
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.overlaps = 0
+
+async def job(stats: Stats, room: int):
+    stats.running[room] += 1
+    stats.in_flight += 1
+    stats.overlaps += stats.running[room] > 1
+    stats.peak_in_flight = max(stats.peak_in_flight, stats.in_flight)
+
+    await asyncio.sleep(0)
+
+    stats.running[room] -= 1
+    stats.in_flight -= 1
+
+async def run(rooms: int, serialized: bool):
+    stats = Stats(rooms)
+    mailboxes = [RoomMailbox(f"bench-{i}") for i in range(rooms)]
+
+    async def connection(room: int):
+        for _ in range(JOBS_PER_CONNECTION):
+            if serialized:
+                await mailboxes[room].call(job, stats, room)
+            else:
+                await job(stats, room)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(connection(room) for room in range(rooms) for _ in range(CONNECTIONS_PER_ROOM)))
+    elapsed = time.perf_counter() - start
+
+    for mailbox in mailboxes:
+        mailbox.close()
+
+    return elapsed / (rooms * CONNECTIONS_PER_ROOM * JOBS_PER_CONNECTION), stats
+
+async def main():
+    print(f"{'rooms':>6} {'path':>8} {'us/job':>8} {'same-room overlaps':>19} {'peak in flight':>15}")
+
+    for rooms in ROOM_COUNTS:
+        for name, serialized in (("direct", False), ("mailbox", True)):
+            per_job, stats = await run(rooms, serialized)
+            print(f"{rooms:>6} {name:>8} {per_job * 1e6:>8.2f} {stats.overlaps:>19} {stats.peak_in_flight:>15}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
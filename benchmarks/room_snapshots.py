@@ -0,0 +1,123 @@
+"""
+Checkpoint and restore cost of room snapshots at 10k rooms.
+
+Fills the worker with mid-game rooms (players, turn order, a buffer of sent frames),
+then reports for a full checkpoint and for an incremental one where 1% of the rooms
+changed: the time spent collecting snapshots on the event loop, the longest single
+stall of the loop while doing so, and the background write. Restore runs in a fresh
+process, the way a restarted worker starts.
+
+    python -m benchmarks.room_snapshots
+    python -m benchmarks.room_snapshots --rooms 2000 --players 8
+"""
+import argparse
+import asyncio
+import os
+import secrets
+import subprocess
+import sys
+import tempfile
+import time
+from unittest import mock
+
+from src.broadcast_message import BroadcastMessage
+from src.events import Event
+from src.player import Player
+from src.room import GameRoom, rooms
+from src.room_registry import room_registry
+from src.room_store import RoomStore
+
+FRAMES_PER_ROOM = 40
+
+def fill(count: int, players: int):
+    for index in range(count):
+        room = GameRoom(f"0{index:05d}")
+
+        for seat in range(players):
+            player = Player(player_id=f"{index}-{seat}", player_name=f"Player {seat}", player_image_url="https://example.com/p.png")
+            room.players[player.player_id] = player
+            room.tokens_by_player[player.player_id] = secrets.token_urlsafe(18)
+
+        room.start_game()
+        room.impostor = f"{index}-0"
+        room.the_word = "Camila Cabello"
+        room.update_player(f"{index}-0", currently_discussing=True)
+
+        for seq in range(FRAMES_PER_ROOM):
+            room.frames.record(BroadcastMessage(Event.PLAYERS_PATCH, room.player_patches.drain() or {"seq": seq, "ops": []}))
+
+        rooms[room.room_id] = room
+        room_registry.claim(room.room_id, 0)
+
+async def watch_stalls(stalls: list):
+    # Longest gap between two turns of the event loop while a checkpoint runs
+    loop = asyncio.get_running_loop()
+    last = loop.time()
+
+    while True:
+        await asyncio.sleep(0)
+        now = loop.time()
+        stalls.append(now - last)
+        last = now
+
+async def checkpoint(store: RoomStore):
+    loop = asyncio.get_running_loop()
+    stalls = []
+    watcher = asyncio.create_task(watch_stalls(stalls))
+    await asyncio.sleep(0)
+
+    start = time.perf_counter()
+    changed, deleted = await store.collect()
+    collected = time.perf_counter() - start
+    watcher.cancel()
+
+    start = time.perf_counter()
+    await loop.run_in_executor(store.executor, store.write, changed, deleted)
+    written = time.perf_counter() - start
+
+    for room_id, applied, _ in changed:
+        store.saved[room_id] = applied
+
+    return len(changed), collected, max(stalls), written
+
+async def main(args):
+    path = os.path.join(tempfile.mkdtemp(), "snapshots.sqlite3")
+    store = RoomStore(path)
+
+    with mock.patch("src.room.logger"), mock.patch("src.room_store.logger"):
+        fill(args.rooms, args.players)
+
+        print(f"{'checkpoint':>12} {'rooms':>6} {'collect ms':>11} {'max stall ms':>13} {'write ms':>9}")
+
+        count, collected, stall, written = await checkpoint(store)
+        print(f"{'full':>12} {count:>6} {collected * 1000:>11.1f} {stall * 1000:>13.1f} {written * 1000:>9.1f}")
+
+        for room in list(rooms.values())[:args.rooms // 100]:
+            room.mailbox.applied += 1
+        count, collected, stall, written = await checkpoint(store)
+        print(f"{'incremental':>12} {count:>6} {collected * 1000:>11.1f} {stall * 1000:>13.1f} {written * 1000:>9.1f}")
+
+        size = os.path.getsize(path)
+        print(f"database: {size / 1e6:.1f} MB ({size / args.rooms / 1024:.1f} KiB per room)")
+
+    store.close()
+    subprocess.run([sys.executable, "-m", "benchmarks.room_snapshots", "--restore", path], check=True)
+
+async def restore(path: str):
+    store = RoomStore(path)
+
+    with mock.patch("src.room_store.logger"):
+        start = time.perf_counter()
+        restored = store.restore()
+
+    print(f"restore: {restored} rooms in {(time.perf_counter() - start) * 1000:.1f} ms")
+    store.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rooms", type=int, default=10_000)
+    parser.add_argument("--players", type=int, default=6)
+    parser.add_argument("--restore", metavar="PATH", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    asyncio.run(restore(args.restore) if args.restore else main(args))
@@ -0,0 +1,129 @@
+"""
+Requests and notification delay of polling /room-status next to watching it.
+
+Clients each follow one of the rooms while players come and go, through the app
+in-process. "poll" asks every --poll-interval seconds like the old clients did;
+"watch" long-polls with If-None-Match and only hears back when its room changed (or
+after STATUS_WATCH_MAX_SECONDS). Reports requests served per second and how long after
+a change its watchers saw it.
+
+    python -m benchmarks.room_status
+    python -m benchmarks.room_status --rooms 50 --clients 1000 --seconds 10
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from unittest import mock
+
+import httpx
+
+from app import app
+from src.room import GameRoom, rooms
+from src.room_lifecycle import room_reaper
+from src.player import Player
+
+class NullSocket:
+    async def send_text(self, frame: str):
+        pass
+
+    async def send_bytes(self, frame: bytes):
+        pass
+
+def open_rooms(count: int) -> list:
+    opened = []
+    for index in range(count):
+        room = GameRoom(f"0{index:05d}")
+        room_reaper.open_room(room)
+        opened.append(room)
+
+    return opened
+
+async def churn(opened: list, changes: dict, seconds: float, rate: float):
+    # Players join or leave a random room `rate` times per second
+    deadline = time.perf_counter() + seconds
+    serial = 0
+
+    while time.perf_counter() < deadline:
+        await asyncio.sleep(random.expovariate(rate))
+        room = random.choice(opened)
+
+        if room.players and random.random() < 0.5:
+            room.forget_player(next(iter(room.players)))
+        else:
+            serial += 1
+            room.add_player(Player(player_id=f"p{serial}", player_name="P", player_image_url="https://example.com/p.png"), NullSocket())
+
+        changes[room.room_id] = (room.players and len(room.players), time.perf_counter())
+
+async def poll(client: httpx.AsyncClient, room_id: str, changes: dict, delays: list, stats: dict, until: float, interval: float):
+    seen = None
+    await asyncio.sleep(random.uniform(0, interval))
+
+    while time.perf_counter() < until:
+        response = await client.get(f"/room-status/{room_id}")
+        stats["requests"] += 1
+
+        players = response.json()["players"]
+        if seen is not None and players != seen and room_id in changes:
+            delays.append(time.perf_counter() - changes[room_id][1])
+        seen = players
+
+        await asyncio.sleep(interval)
+
+async def watch(client: httpx.AsyncClient, room_id: str, changes: dict, delays: list, stats: dict, until: float, interval: float):
+    etag = None
+
+    while time.perf_counter() < until:
+        headers = {"If-None-Match": etag} if etag else {}
+        response = await client.get(f"/room-status/{room_id}", params={"wait": until - time.perf_counter()}, headers=headers)
+        stats["requests"] += 1
+
+        if response.status_code == 200:
+            if etag is not None and room_id in changes:
+                delays.append(time.perf_counter() - changes[room_id][1])
+            etag = response.headers["etag"]
+
+async def run(args, follower) -> tuple:
+    rooms.clear()
+    opened = open_rooms(args.rooms)
+    changes, delays, stats = {}, [], {"requests": 0}
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        until = time.perf_counter() + args.seconds
+        followers = [follower(client, opened[index % args.rooms].room_id, changes, delays, stats, until, args.poll_interval)
+                     for index in range(args.clients)]
+
+        start = time.perf_counter()
+        await asyncio.gather(churn(opened, changes, args.seconds, args.changes), *followers)
+        elapsed = time.perf_counter() - start
+
+    for room in opened:
+        for queue in room.outbound.values():
+            queue.close()
+
+    return stats["requests"] / elapsed, delays
+
+async def main(args):
+    print(f"{'mode':>6} {'requests/s':>11} {'delay p50 ms':>13} {'delay p99 ms':>13}")
+
+    for name, follower in (("poll", poll), ("watch", watch)):
+        throughput, delays = await run(args, follower)
+        delays.sort()
+        p50 = statistics.median(delays) * 1000 if delays else float("nan")
+        p99 = delays[int(len(delays) * 0.99)] * 1000 if delays else float("nan")
+        print(f"{name:>6} {throughput:>11.0f} {p50:>13.1f} {p99:>13.1f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rooms", type=int, default=100)
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--changes", type=float, default=20.0, help="player joins and leaves per second, across all rooms")
+    parser.add_argument("--poll-interval", type=float, default=1.0)
+    args = parser.parse_args()
+
+    with mock.patch("src.room.logger"), mock.patch("src.logs.logger"), mock.patch("src.outbound_queue.logger"):
+        asyncio.run(main(args))
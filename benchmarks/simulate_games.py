@@ -0,0 +1,335 @@
+"""
+Headless games played against GameRoom, the event handlers and the controller, with no network.
+
+Every player gets a stub socket. Inbound frames are decoded by the real decoder and
+dispatched through the room's mailbox, the same way the websocket receive loop does it.
+Outbound frames are queued and drained as usual, but the stub socket just counts them.
+This leaves the game logic's own cost, from a frame being received to every reply
+being delivered, without the network's share.
+
+The rooms are split into chunks and the chunks are spread over a process pool. Inside
+a chunk, all rooms play each phase side by side: join, ready (with the countdown set to
+0), one end_turn per turn, then one random vote per player. Every chunk seeds `random`
+from --seed and its own index, so the same seed gives the same games and the same
+digest, whatever --workers is.
+
+The results are printed as JSON, or written with --output:
+- throughput: games, inbound events and delivered frames per second;
+- how much time each phase took;
+- fairness across all games:
+  - which seat was dealt the impostor;
+  - which seat spoke first;
+  - where the impostor spoke in the first round;
+  - how the words were spread over the deck.
+  Each fairness count comes with a chi-square test against a uniform spread.
+
+    python -m benchmarks.simulate_games
+    python -m benchmarks.simulate_games --rooms 5000 --games 10 --workers 8 --seed 7
+    python -m benchmarks.simulate_games --rooms 200 --profile simulate.prof
+"""
+import os
+
+# Read by src.config on import, in this process and in every worker
+os.environ.setdefault("COUNTDOWN_SECONDS", "0")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+import argparse
+import asyncio
+import cProfile
+import hashlib
+import json
+import math
+import pstats
+import random
+import subprocess
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Sequence, Tuple, Union
+
+from src.room import GameRoom, delete_room
+from src.room_lifecycle import room_reaper
+from src.player import Player
+from src.events import Event
+from src.event_handler import event_decoder, dispatch
+from src.logs import configure_logging
+
+PHASES = ("join", "ready", "turns", "voting")
+
+class StubSocket:
+    """Takes frames the way a websocket would. The first seat also keeps them, to read each game's outcome."""
+    def __init__(self, keep: bool = False):
+        self.frames = 0
+        self.bytes = 0
+        self.kept: Union[List[str], None] = [] if keep else None
+
+    async def send_text(self, frame: str):
+        self.frames += 1
+        self.bytes += len(frame)
+
+        if self.kept is not None:
+            self.kept.append(frame)
+
+    async def send_bytes(self, frame: bytes):
+        await self.send_text(frame)
+
+    async def close(self, code: int = 1000):
+        pass
+
+async def settled():
+    pass
+
+class SimRoom:
+    def __init__(self, room_id: str, players: int, rounds: int):
+        self.room = GameRoom(room_id, number_of_rounds=rounds, flush_tick=0)
+        room_reaper.open_room(self.room)
+
+        self.players = [Player(player_id=f"p{seat}", player_name=f"Player {seat}", player_image_url="https://example.com/p.png")
+                        for seat in range(players)]
+        self.sockets = [StubSocket(keep=seat == 0) for seat in range(players)]
+        self.events = 0
+        self.failed = False
+
+    async def send(self, seat: int, event: str, data: Union[Dict, None] = None):
+        message = event_decoder.decode(json.dumps({"event": event, "data": data or {}}))
+        self.events += 1
+
+        await self.room.call(dispatch, message, self.sockets[seat], self.room, self.players[seat])
+
+    async def join(self):
+        for seat, player in enumerate(self.players):
+            await self.room.call(self.room.join, player, self.sockets[seat])
+
+    async def ready(self):
+        self.sockets[0].kept.clear()
+
+        for seat in range(len(self.players)):
+            await self.send(seat, Event.SET_READY)
+
+        # The countdown ends in a job of its own, queued behind the last ready
+        await self.room.call(settled)
+
+    async def turns(self) -> List[int]:
+        speakers = []
+
+        while not self.room.is_voting:
+            speaker = next((seat for seat, player in enumerate(self.players) if player.currently_discussing), None)
+            if speaker is None or len(speakers) > len(self.players) * self.room.number_of_rounds:
+                raise RuntimeError(f"no turn to end in room {self.room.room_id}")
+
+            speakers.append(speaker)
+            await self.send(speaker, Event.END_TURN)
+
+        return speakers
+
+    async def voting(self):
+        for seat in range(len(self.players)):
+            voted = random.choice([other for other in range(len(self.players)) if other != seat])
+            await self.send(seat, Event.SET_VOTE, {"voted": self.players[voted].player_id})
+
+    def outcome(self) -> Union[Dict, None]:
+        for frame in reversed(self.sockets[0].kept):
+            message = json.loads(frame)
+
+            if message["event"] == Event.SHOW_IMPOSTOR:
+                return message["data"]
+
+        return None
+
+    def drained(self) -> bool:
+        return all(queue.depth == 0 for queue in self.room.outbound.values())
+
+async def play_chunk(chunk: int, seed: int, room_count: int, players: int, rounds: int, games: int) -> Dict:
+    random.seed(f"{seed}:{chunk}")
+    sims = [SimRoom(f"sim-{chunk}-{index}", players, rounds) for index in range(room_count)]
+    phases = dict.fromkeys(PHASES, 0.0)
+    records, errors = [], 0
+
+    async def attempt(sim: SimRoom, step):
+        try:
+            return await step(sim)
+        except Exception as e:
+            sim.failed = True
+            print(f"room {sim.room.room_id} failed: {e!r}", file=sys.stderr)
+
+    async def phase(name: str, step) -> list:
+        start = time.perf_counter()
+        results = await asyncio.gather(*(attempt(sim, step) for sim in sims))
+
+        # A phase ends once every frame it produced has reached its socket
+        while not all(sim.drained() for sim in sims):
+            await asyncio.sleep(0)
+
+        phases[name] += time.perf_counter() - start
+        return results
+
+    await phase("join", SimRoom.join)
+
+    for game in range(games):
+        sims = [sim for sim in sims if not sim.failed]
+
+        await phase("ready", SimRoom.ready)
+        deals = [(sim.room.impostor, sim.room.the_word) for sim in sims]
+        speakers = await phase("turns", SimRoom.turns)
+        await phase("voting", SimRoom.voting)
+
+        for sim, (impostor, word), order in zip(sims, deals, speakers):
+            shown = None if sim.failed else sim.outcome()
+
+            if shown is None or shown["impostor"] != impostor:
+                errors += 1
+                sim.failed = True
+                continue
+
+            records.append({"room": sim.room.room_id,
+                            "game": game,
+                            "impostor": int(impostor[1:]),
+                            "word": word,
+                            "speakers": order,
+                            "winner": shown["winner"]})
+
+    frames = sum(socket.frames for sim in sims for socket in sim.sockets)
+    delivered = sum(socket.bytes for sim in sims for socket in sim.sockets)
+    events = sum(sim.events for sim in sims)
+    pool = len(sims[0].room.words.pool) if sims else 0
+
+    for sim in sims:
+        delete_room(sim.room.room_id)
+        await sim.room.close()
+
+        for queue in sim.room.outbound.values():
+            queue.close()
+
+    return {"chunk": chunk, "phases": phases, "records": records, "errors": errors,
+            "events": events, "frames": frames, "bytes": delivered, "pool": pool}
+
+def run_chunk(task: Tuple) -> Dict:
+    cpu = time.process_time()
+    result = asyncio.run(play_chunk(*task))
+    result["cpu_s"] = time.process_time() - cpu
+
+    return result
+
+def chi_square(counts: Sequence[int], categories: Union[int, None] = None) -> Dict:
+    # Against a uniform spread; categories never seen count as zeros
+    categories = categories or len(counts)
+    total = sum(counts)
+    if categories < 2 or total == 0:
+        return {"statistic": 0.0, "dof": 0, "p": 1.0}
+
+    expected = total / categories
+    statistic = sum((count - expected) ** 2 for count in counts) / expected + (categories - len(counts)) * expected
+    dof = categories - 1
+
+    # Wilson-Hilferty approximation of the upper tail, close enough from a few degrees of freedom
+    z = ((statistic / dof) ** (1 / 3) - (1 - 2 / (9 * dof))) / math.sqrt(2 / (9 * dof))
+    return {"statistic": statistic, "dof": dof, "p": 0.5 * math.erfc(z / math.sqrt(2))}
+
+def fairness(records: List[Dict], players: int, pool: int) -> Dict:
+    impostors = Counter(record["impostor"] for record in records)
+    first = Counter(record["speakers"][0] for record in records)
+    positions = Counter(record["speakers"][:players].index(record["impostor"]) for record in records)
+    words = Counter(record["word"] for record in records)
+
+    repeats, dealt = 0, {}
+    for record in records:
+        seen = dealt.setdefault(record["room"], set())
+        repeats += record["word"] in seen
+        seen.add(record["word"])
+
+    def seats(counts: Counter) -> Dict:
+        spread = [counts[seat] for seat in range(players)]
+        return {"counts": spread, **chi_square(spread)}
+
+    return {
+        "impostor_seat": seats(impostors),
+        "first_speaker_seat": seats(first),
+        "impostor_turn_position": seats(positions),
+        "words": {"draws": len(records),
+                  "pool": pool,
+                  "distinct": len(words),
+                  "most_drawn": max(words.values(), default=0),
+                  "repeats_within_room": repeats,
+                  **chi_square(list(words.values()), pool)},
+        "winners": dict(Counter(record["winner"] for record in records)),
+    }
+
+def summarize(results: List[Dict], duration: float, args) -> Dict:
+    records = [record for result in results for record in result["records"]]
+    games = len(records)
+    phase_total = {name: sum(result["phases"][name] for result in results) for name in PHASES}
+    busy = sum(phase_total.values()) or 1.0
+
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = None
+
+    return {
+        "commit": commit,
+        "config": {"rooms": args.rooms, "players": args.players, "rounds": args.rounds, "games": args.games,
+                   "chunk": args.chunk, "workers": args.workers, "seed": args.seed},
+        "duration_s": duration,
+        "cpu_s": sum(result["cpu_s"] for result in results),
+        "games_completed": games,
+        "errors": sum(result["errors"] for result in results),
+        "games_per_s": games / duration,
+        "events_per_s": sum(result["events"] for result in results) / duration,
+        "frames_per_s": sum(result["frames"] for result in results) / duration,
+        "bytes_per_frame": sum(result["bytes"] for result in results) / max(sum(result["frames"] for result in results), 1),
+        # Summed over chunks, so they add up to the time spent playing rather than wall time
+        "phases": {name: {"total_s": total, "share": total / busy, "ms_per_game": total / max(games, 1) * 1000}
+                   for name, total in phase_total.items()},
+        "fairness": fairness(records, args.players, max((result["pool"] for result in results), default=0)),
+        "digest": hashlib.sha256(json.dumps(records, sort_keys=True).encode()).hexdigest()[:16],
+    }
+
+def run(args) -> List[Dict]:
+    tasks = [(chunk, args.seed, min(args.chunk, args.rooms - start), args.players, args.rounds, args.games)
+             for chunk, start in enumerate(range(0, args.rooms, args.chunk))]
+
+    if args.profile:
+        configure_logging(enqueue=False)
+        profile = cProfile.Profile()
+        results = profile.runcall(lambda: [run_chunk(task) for task in tasks])
+
+        profile.dump_stats(args.profile)
+        pstats.Stats(profile, stream=sys.stderr).sort_stats("cumulative").print_stats(25)
+        return results
+
+    if args.workers == 0:
+        configure_logging(enqueue=False)
+        return [run_chunk(task) for task in tasks]
+
+    with ProcessPoolExecutor(args.workers, initializer=configure_logging, initargs=(os.environ["LOG_LEVEL"], False)) as pool:
+        return sorted(pool.map(run_chunk, tasks), key=lambda result: result["chunk"])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rooms", type=int, default=2000)
+    parser.add_argument("--players", type=int, default=6)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--games", type=int, default=5, help="games played in a row by every room")
+    parser.add_argument("--chunk", type=int, default=100, help="rooms played side by side by one worker")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="0 plays every chunk in this process")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--profile", help="play in this process under cProfile and write the stats to this file")
+    parser.add_argument("--output", help="write the JSON results to this file")
+    args = parser.parse_args()
+
+    if args.players < 2:
+        parser.error("a game needs at least 2 players")
+
+    started = time.perf_counter()
+    results = run(args)
+    output = json.dumps(summarize(results, time.perf_counter() - started, args), indent=2)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output)
+
+    print(output)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Whether a large audience slows down delivery to a room's players.
+
+A room of 8 players broadcasts through its mailbox while up to 500 spectators (the
+default cap) watch, half of them on each wire format. Reports, per audience size, how long a broadcast took to
+reach every player's socket, how long the broadcast held the room's mailbox, how long
+spectators waited for it (they are fed once per tick), and how many times each frame
+was encoded.
+
+    python -m benchmarks.spectators
+"""
+import asyncio
+import statistics
+import time
+from unittest import mock
+
+from src.room import GameRoom
+from src.player import Player
+from src.broadcast_message import BroadcastMessage
+from src.events import Event
+from src import wire_format
+
+# Up to the default MAX_SPECTATORS_PER_ROOM
+AUDIENCES = [0, 100, 250, 500]
+PLAYERS = 8
+BROADCASTS = 100
+TICK_SECONDS = 0.05
+
+class TimedSocket:
+    def __init__(self):
+        self.count = 0
+        self.last = 0.0
+
+    async def send_text(self, frame: str):
+        self.count += 1
+        self.last = time.perf_counter()
+
+    async def send_bytes(self, frame: bytes):
+        await self.send_text("")
+
+async def run(audience: int):
+    room = GameRoom("bench", flush_tick=0)
+    room.spectators.tick = TICK_SECONDS
+    player_sockets, spectator_sockets = [], []
+
+    for seat in range(PLAYERS):
+        socket = TimedSocket()
+        player_sockets.append(socket)
+        room.add_player(Player(player_id=f"player-{seat}", player_name=f"Player {seat}", player_image_url="https://example.com/p.png"), socket)
+
+    for index in range(audience):
+        socket = TimedSocket()
+        spectator_sockets.append(socket)
+        await room.add_spectator(socket, wire_format.WireFormat.JSON if index % 2 else wire_format.WireFormat.MSGPACK)
+
+    player_latency, spectator_latency, held = [], [], []
+    # Let the snapshots sent on joining go out first
+    await asyncio.sleep(TICK_SECONDS)
+
+    with mock.patch("src.broadcast_message.encode_frame", wraps=wire_format.encode_frame) as encode:
+        for turn in range(BROADCASTS):
+            message = BroadcastMessage(Event.UPDATED_VOTING_LIST, {"turn": turn})
+
+            # Every socket gets exactly one frame per broadcast
+            player_target = player_sockets[0].count + 1
+            spectator_target = spectator_sockets[0].count + 1 if spectator_sockets else 0
+
+            start = time.perf_counter()
+            await room.call(room.send_to_all_players, message)
+            held.append(time.perf_counter() - start)
+
+            while any(socket.count < player_target for socket in player_sockets):
+                await asyncio.sleep(0)
+            player_latency.append(max(socket.last for socket in player_sockets) - start)
+
+            while any(socket.count < spectator_target for socket in spectator_sockets):
+                await asyncio.sleep(0.001)
+            if spectator_sockets:
+                spectator_latency.append(max(socket.last for socket in spectator_sockets) - start)
+
+        encodes = encode.call_count / BROADCASTS
+
+    await room.close()
+    for queue in room.outbound.values():
+        queue.close()
+
+    return player_latency, held, spectator_latency, encodes
+
+async def main():
+    print(f"{'spectators':>10} {'players p50 ms':>15} {'players max ms':>15} {'mailbox max ms':>15} {'spectators max ms':>18} {'encodes':>8}")
+
+    for audience in AUDIENCES:
+        players, held, spectators, encodes = await run(audience)
+        spectators_max = f"{max(spectators) * 1000:.1f}" if spectators else "-"
+        print(f"{audience:>10} {statistics.median(players) * 1000:>15.3f} {max(players) * 1000:>15.3f} "
+              f"{max(held) * 1000:>15.3f} {spectators_max:>18} {encodes:>8.1f}")
+
+if __name__ == "__main__":
+    with mock.patch("src.room.logger"), mock.patch("src.outbound_queue.logger"), mock.patch("src.logs.logger"):
+        asyncio.run(main())
@@ -0,0 +1,60 @@
+"""
+Cost of the shared deadline scheduler as the number of rooms grows.
+
+Every room gets a turn deadline, has it replaced a few times (what each end_turn
+does) and then lets it fire. Reports the cost per schedule, how late deadlines fire,
+and how many asyncio tasks exist while they are pending.
+
+    python -m benchmarks.timers
+"""
+import asyncio
+import random
+import time
+
+from src.scheduler import Scheduler
+
+ROOM_COUNTS = [1_000, 10_000, 50_000]
+RESCHEDULES = 3
+# Deadlines start after the scheduling burst so it does not count as lateness
+FIRST_DEADLINE_SECONDS = 2.0
+SPREAD_SECONDS = 1.0
+
+async def run(rooms: int):
+    scheduler = Scheduler()
+    loop = asyncio.get_running_loop()
+    lateness = []
+
+    def fired(due: float):
+        lateness.append(loop.time() - due)
+
+    start = time.perf_counter()
+    handles = []
+    for _ in range(rooms):
+        handle = None
+        for _ in range(RESCHEDULES + 1):
+            if handle:
+                handle.cancel()
+            delay = FIRST_DEADLINE_SECONDS + random.uniform(0, SPREAD_SECONDS)
+            due = loop.time() + delay
+            handle = scheduler.call_later(delay, lambda due=due: fired(due))
+        handles.append(handle)
+    per_schedule = (time.perf_counter() - start) / (rooms * (RESCHEDULES + 1))
+
+    tasks = len(asyncio.all_tasks())
+
+    while len(lateness) < rooms:
+        await asyncio.sleep(0.05)
+
+    scheduler.task.cancel()
+    lateness.sort()
+    return per_schedule, lateness[len(lateness) // 2], lateness[int(len(lateness) * 0.99)], tasks
+
+async def main():
+    print(f"{'rooms':>8} {'us/schedule':>12} {'p50 late ms':>12} {'p99 late ms':>12} {'tasks':>6}")
+
+    for rooms in ROOM_COUNTS:
+        per_schedule, p50, p99, tasks = await run(rooms)
+        print(f"{rooms:>8} {per_schedule * 1e6:>12.2f} {p50 * 1000:>12.2f} {p99 * 1000:>12.2f} {tasks:>6}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
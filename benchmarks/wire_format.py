@@ -0,0 +1,65 @@
+"""
+Frame size and codec cost of the JSON and MessagePack wire formats.
+
+Encodes the frames a game actually sends (a one-field patch, a full snapshot, the game
+start word and the impostor reveal) and decodes the inbound events a client sends, in
+both formats. Sizes are what goes over the socket per recipient.
+
+    python -m benchmarks.wire_format
+"""
+import time
+
+from src.broadcast_message import BroadcastMessage
+from src.event_handler import event_decoder
+from src.events import Event
+from src.player import Player
+from src.wire_format import WireFormat, encode_frame
+
+ROUNDS = 20_000
+LOBBY_SIZE = 8
+
+def players():
+    return [Player(player_id=f"8c1e2f64-1b7a-4c7e-9a55-{i:012d}",
+                   player_name=f"Player {i}",
+                   player_image_url="https://blog.spoongraphics.co.uk/wp-content/uploads/2017/vector-characters/24.png").to_dict()
+            for i in range(LOBBY_SIZE)]
+
+def outbound_frames():
+    lobby = players()
+    return {
+        "patch": (Event.PLAYERS_PATCH, {"seq": 42, "ops": [{"op": "update", "player_id": lobby[0]["player_id"], "fields": {"is_ready": True}}]}),
+        "snapshot": (Event.UPDATED_PLAYERS_LIST, {"players": lobby, "seq": 42}),
+        "game_start": (Event.GAME_START, {"is_impostor": False, "word": "Camila Cabello"}),
+        "show_impostor": (Event.SHOW_IMPOSTOR, {"impostor": lobby[0]["player_id"], "winner": "players", "word": "Camila Cabello",
+                                                "votes": [{"player_id": lobby[0]["player_id"], "voted_this_guy": [p["player_image_url"] for p in lobby]}]}),
+    }
+
+def inbound_frames():
+    return {
+        "set_ready": (Event.SET_READY, {}),
+        "set_name": (Event.SET_NAME, {"new_name": "Juan dela Cruz"}),
+        "set_vote": (Event.SET_VOTE, {"voted": "8c1e2f64-1b7a-4c7e-9a55-000000000003"}),
+    }
+
+def per_call(function) -> float:
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        function()
+    return (time.perf_counter() - start) / ROUNDS
+
+def main():
+    print(f"{'outbound':>14} {'json B':>7} {'msgpack B':>10} {'json us':>8} {'msgpack us':>11}")
+    for name, (event, data) in outbound_frames().items():
+        sizes = [len(BroadcastMessage(event, data).encode(wire_format)) for wire_format in WireFormat]
+        costs = [per_call(lambda: encode_frame(event, data, wire_format)) for wire_format in WireFormat]
+        print(f"{name:>14} {sizes[0]:>7} {sizes[1]:>10} {costs[0] * 1e6:>8.2f} {costs[1] * 1e6:>11.2f}")
+
+    print()
+    print(f"{'inbound':>14} {'json B':>7} {'msgpack B':>10} {'json us':>8} {'msgpack us':>11}")
+    for name, (event, data) in inbound_frames().items():
+        frames = [encode_frame(event, data, wire_format) for wire_format in WireFormat]
+        costs = [per_call(lambda: event_decoder.decode(frame)) for frame in frames]
+        print(f"{name:>14} {len(frames[0]):>7} {len(frames[1]):>10} {costs[0] * 1e6:>8.2f} {costs[1] * 1e6:>11.2f}")
+
+if __name__ == "__main__":
+    main()
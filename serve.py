@@ -0,0 +1,42 @@
+"""
+Starts one uvicorn process per worker, each on its own port.
+
+Every worker owns the rooms whose ID starts with its index, so with more than one
+worker set ROOM_REGISTRY_BACKEND=sqlite and point WORKER_URL_TEMPLATE at an address
+clients can reach.
+
+    WORKER_COUNT=4 ROOM_REGISTRY_BACKEND=sqlite python serve.py
+"""
+import os
+import signal
+import subprocess
+import sys
+
+from src.config import WORKER_COUNT, WORKER_HOST, WORKER_BASE_PORT
+
+def spawn(worker: int) -> subprocess.Popen:
+    env = dict(os.environ, WORKER_INDEX=str(worker))
+    command = [sys.executable, "-m", "uvicorn", "app:app",
+               "--host", WORKER_HOST,
+               "--port", str(WORKER_BASE_PORT + worker)]
+
+    return subprocess.Popen(command, env=env)
+
+def main():
+    workers = [spawn(worker) for worker in range(WORKER_COUNT)]
+
+    def stop(signum, frame):
+        for process in workers:
+            process.terminate()
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    exit_code = 0
+    for process in workers:
+        exit_code = process.wait() or exit_code
+
+    sys.exit(exit_code)
+
+if __name__ == "__main__":
+    main()
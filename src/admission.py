@@ -0,0 +1,122 @@
+from typing import Dict, Tuple, Union
+from time import monotonic
+
+from .events import Event
+from .metrics import Counter, OPEN_CONNECTIONS
+from .config import INBOUND_RATE_LIMITS, MAX_CONNECTIONS, MAX_ROOMS, MAX_PLAYERS_PER_ROOM, OVERLOAD_RETRY_AFTER_SECONDS
+
+INBOUND_THROTTLED = Counter("balatkayo_inbound_throttled_total", "Inbound frames dropped by a connection's rate limit")
+ADMISSIONS_REJECTED = Counter("balatkayo_admissions_rejected_total", "Room creations and joins turned away by a global cap")
+
+# Bucket shared by every event without a limit of its own, and by frames that fail to decode
+DEFAULT_LIMIT = "default"
+
+def parse_rate_limits(spec: str) -> Dict[str, Tuple[float, float]]:
+    # "set_name=0.5/3,default=10/20": refill rate per second / burst, per event name
+    limits = {}
+
+    for entry in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, limit = entry.partition("=")
+        rate, _, burst = limit.partition("/")
+        name = name.strip()
+
+        if name != DEFAULT_LIMIT:
+            Event(name)
+
+        limits[name] = (float(rate), float(burst or rate))
+
+    return limits
+
+rate_limits = parse_rate_limits(INBOUND_RATE_LIMITS)
+
+class TokenBucket:
+    __slots__ = ("rate", "burst", "tokens", "updated")
+
+    def __init__(self, rate: float, burst: float, now: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = now
+
+    def take(self, now: float) -> bool:
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+        if self.tokens < 1:
+            return False
+
+        self.tokens -= 1
+        return True
+
+    def retry_after(self) -> float:
+        return (1 - self.tokens) / self.rate if self.rate > 0 else OVERLOAD_RETRY_AFTER_SECONDS
+
+class InboundLimiter:
+    """
+    Token buckets for one connection, one per event type, created on the first frame of
+    that type. `allow` answers whether the frame may be applied; the first frame dropped
+    in a row of dropped frames is reported through `should_notify`, so a flooding client
+    gets one notice rather than one reply per frame it sent.
+    """
+    __slots__ = ("limits", "buckets", "throttled")
+
+    def __init__(self, limits: Dict[str, Tuple[float, float]] = rate_limits):
+        self.limits = limits
+        self.buckets: Dict[str, TokenBucket] = {}
+        self.throttled = False
+
+    def allow(self, event: Union[str, None]) -> bool:
+        if event not in self.limits:
+            event = DEFAULT_LIMIT
+
+        bucket = self.buckets.get(event)
+        now = monotonic()
+
+        if bucket is None:
+            limit = self.limits.get(event)
+            if limit is None:
+                return True
+
+            bucket = self.buckets[event] = TokenBucket(*limit, now)
+
+        if bucket.take(now):
+            self.throttled = False
+            return True
+
+        INBOUND_THROTTLED.inc()
+        return False
+
+    def should_notify(self) -> bool:
+        notify = not self.throttled
+        self.throttled = True
+
+        return notify
+
+    def retry_after(self, event: Union[str, None]) -> float:
+        bucket = self.buckets.get(event if event in self.limits else DEFAULT_LIMIT)
+
+        return bucket.retry_after() if bucket else 0.0
+
+def connections_full() -> bool:
+    return MAX_CONNECTIONS > 0 and OPEN_CONNECTIONS.value > MAX_CONNECTIONS
+
+def room_refusal(room_count: int) -> Union[str, None]:
+    # Why a new room should be turned away right now, if it should
+    if MAX_ROOMS > 0 and room_count >= MAX_ROOMS:
+        return "too_many_rooms"
+    if connections_full():
+        return "too_many_connections"
+
+    return None
+
+def join_refusal() -> Union[str, None]:
+    # Checked before a new player joins; resumed sessions take back a slot they already had
+    return "too_many_connections" if connections_full() else None
+
+def room_is_full(player_count: int) -> bool:
+    return MAX_PLAYERS_PER_ROOM > 0 and player_count >= MAX_PLAYERS_PER_ROOM
+
+def reject(reason: str):
+    ADMISSIONS_REJECTED.inc()
+
+    return {"error": reason, "retry_after": OVERLOAD_RETRY_AFTER_SECONDS}
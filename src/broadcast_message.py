@@ -1,17 +1,50 @@
 from .events import Event
 from enum import StrEnum
+from typing import Dict, Union
+from time import perf_counter
+
+from .metrics import ENCODE_SECONDS
+from .wire_format import WireFormat, encode_frame
+
+# Full-state events where only the newest frame matters to a client that is behind
+COALESCED_EVENTS = {Event.UPDATED_PLAYERS_LIST}
 
 class BroadcastMessage:
-    def __init__(self, event: str, data: dict):
+    def __init__(self, event: str, data: dict, sequenced: bool = True):
         self.event = event
         self.data = data
+        # Stamped by the room's FrameLog when first sent; shared messages stay unsequenced
+        self.sequenced = sequenced
+        self.seq: Union[int, None] = None
+        self._frames: Dict[WireFormat, Union[str, bytes]] = {}
 
     def to_dict(self):
         return {"event": self.event, "data": self.data}
     
+    def encode(self, wire_format: WireFormat = WireFormat.JSON) -> Union[str, bytes]:
+        # Encoded once per wire format and reused for every recipient of the broadcast
+        frame = self._frames.get(wire_format)
+        
+        if frame is None:
+            start = perf_counter()
+            frame = self._frames[wire_format] = encode_frame(self.event, self.data, wire_format, self.seq)
+            ENCODE_SECONDS.observe(perf_counter() - start)
+        
+        return frame
+    
+    @property
+    def frame(self) -> str:
+        return self.encode(WireFormat.JSON)
+    
+    @property
+    def coalesce_key(self) -> Union[str, None]:
+        return self.event if self.event in COALESCED_EVENTS else None
+    
 class DefaultMessage(StrEnum):
     INVALID_ROOM_ID = "invalid_room_id"
+    INVALID_MESSAGE = "invalid_message"
    
 default_messages = {
-    DefaultMessage.INVALID_ROOM_ID : BroadcastMessage(Event.INVALID_ROOM_ID, {"message": "Invalid room id!"})
+    DefaultMessage.INVALID_ROOM_ID : BroadcastMessage(Event.INVALID_ROOM_ID, {"message": "Invalid room id!"}, sequenced=False),
+    DefaultMessage.INVALID_MESSAGE : BroadcastMessage(Event.INVALID_MESSAGE, {"message": "Invalid message!"}, sequenced=False)
 }
\ No newline at end of file
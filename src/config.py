@@ -1,7 +1,93 @@
 from pathlib import Path
+from decouple import config
 
 PROJ_ROOT = Path(__file__).resolve().parents[1]
 
 STATIC_DIR = PROJ_ROOT / "static"
 
-DEFAULT_PLAYER_IMAGE = "https://blog.spoongraphics.co.uk/wp-content/uploads/2017/vector-characters/24.png"
\ No newline at end of file
+DEFAULT_PLAYER_IMAGE = "https://blog.spoongraphics.co.uk/wp-content/uploads/2017/vector-characters/24.png"
+
+COUNTDOWN_SECONDS = config("COUNTDOWN_SECONDS", default=3.0, cast=float)
+
+# Outbound queue per connection: past the high-water mark a client has a grace
+# period to catch up, past the limit it is evicted immediately.
+OUTBOUND_QUEUE_HIGH_WATER = config("OUTBOUND_QUEUE_HIGH_WATER", default=64, cast=int)
+OUTBOUND_QUEUE_LIMIT = config("OUTBOUND_QUEUE_LIMIT", default=256, cast=int)
+OUTBOUND_QUEUE_GRACE_SECONDS = config("OUTBOUND_QUEUE_GRACE_SECONDS", default=5.0, cast=float)
+OUTBOUND_CLOSE_TIMEOUT_SECONDS = config("OUTBOUND_CLOSE_TIMEOUT_SECONDS", default=2.0, cast=float)
+
+# Multi-worker mode: every worker listens on WORKER_BASE_PORT + WORKER_INDEX and owns
+# the rooms whose ID starts with its index. Other workers point clients at the owner
+# through WORKER_URL_TEMPLATE.
+WORKER_COUNT = config("WORKER_COUNT", default=1, cast=int)
+WORKER_INDEX = config("WORKER_INDEX", default=0, cast=int)
+WORKER_HOST = config("WORKER_HOST", default="0.0.0.0")
+WORKER_BASE_PORT = config("WORKER_BASE_PORT", default=8000, cast=int)
+WORKER_URL_TEMPLATE = config("WORKER_URL_TEMPLATE", default="http://127.0.0.1:{port}")
+
+# "memory" keeps the registry inside the process, "sqlite" shares it between workers on one box
+ROOM_REGISTRY_BACKEND = config("ROOM_REGISTRY_BACKEND", default="memory")
+ROOM_REGISTRY_PATH = config("ROOM_REGISTRY_PATH", default=str(PROJ_ROOT / "room_registry.sqlite3"))
+# Status changes and releases reach the shared registry in one write every ROOM_REGISTRY_FLUSH_SECONDS;
+# a write gives up after ROOM_REGISTRY_BUSY_TIMEOUT_SECONDS instead of holding up the event loop
+ROOM_REGISTRY_FLUSH_SECONDS = config("ROOM_REGISTRY_FLUSH_SECONDS", default=0.5, cast=float)
+ROOM_REGISTRY_BUSY_TIMEOUT_SECONDS = config("ROOM_REGISTRY_BUSY_TIMEOUT_SECONDS", default=0.05, cast=float)
+
+# Rooms nobody has joined or that everyone left are reaped after EMPTY_ROOM_TTL_SECONDS,
+# rooms with players but no events after IDLE_ROOM_TTL_SECONDS
+EMPTY_ROOM_TTL_SECONDS = config("EMPTY_ROOM_TTL_SECONDS", default=300.0, cast=float)
+IDLE_ROOM_TTL_SECONDS = config("IDLE_ROOM_TTL_SECONDS", default=3600.0, cast=float)
+ROOM_SWEEP_INTERVAL_SECONDS = config("ROOM_SWEEP_INTERVAL_SECONDS", default=10.0, cast=float)
+
+# Server-side deadlines; a turn or vote that runs out advances the game. 0 disables.
+TURN_SECONDS = config("TURN_SECONDS", default=60.0, cast=float)
+VOTE_SECONDS = config("VOTE_SECONDS", default=60.0, cast=float)
+
+# When above 0, player-list changes are merged and broadcast at most once per tick per room
+STATE_FLUSH_TICK_SECONDS = config("STATE_FLUSH_TICK_SECONDS", default=0.0, cast=float)
+
+# A player whose socket drops keeps their slot for RESUME_GRACE_SECONDS and can resume with
+# their token; the room keeps its last RESUME_BUFFER_FRAMES frames to replay what they missed
+RESUME_GRACE_SECONDS = config("RESUME_GRACE_SECONDS", default=30.0, cast=float)
+RESUME_BUFFER_FRAMES = config("RESUME_BUFFER_FRAMES", default=256, cast=int)
+
+# Rooms are checkpointed to ROOM_SNAPSHOT_PATH every ROOM_SNAPSHOT_INTERVAL_SECONDS and
+# restored on startup, with every player holding their slot for RESUME_GRACE_SECONDS. 0 disables.
+ROOM_SNAPSHOT_PATH = config("ROOM_SNAPSHOT_PATH", default=str(PROJ_ROOT / "room_snapshots.sqlite3"))
+ROOM_SNAPSHOT_INTERVAL_SECONDS = config("ROOM_SNAPSHOT_INTERVAL_SECONDS", default=2.0, cast=float)
+
+# Inbound frames per connection, as a token bucket per event: "event=rate/burst" with the rate
+# in frames per second. "default" covers every other event and frames that fail to decode.
+INBOUND_RATE_LIMITS = config("INBOUND_RATE_LIMITS", default="set_name=0.5/3,set_image=0.5/3,resync=0.5/2,default=10/20")
+
+# Global caps; past them new rooms and joins are turned away while existing games carry on.
+# Rejections tell clients to retry after OVERLOAD_RETRY_AFTER_SECONDS. 0 disables a cap.
+MAX_CONNECTIONS = config("MAX_CONNECTIONS", default=10000, cast=int)
+MAX_ROOMS = config("MAX_ROOMS", default=2000, cast=int)
+MAX_PLAYERS_PER_ROOM = config("MAX_PLAYERS_PER_ROOM", default=12, cast=int)
+OVERLOAD_RETRY_AFTER_SECONDS = config("OVERLOAD_RETRY_AFTER_SECONDS", default=5, cast=int)
+
+# Clients that opt in with "heartbeat" in identify are pinged every HEARTBEAT_INTERVAL_SECONDS
+# and evicted after HEARTBEAT_TIMEOUT_SECONDS without any frame from them. 0 disables.
+HEARTBEAT_INTERVAL_SECONDS = config("HEARTBEAT_INTERVAL_SECONDS", default=15.0, cast=float)
+HEARTBEAT_TIMEOUT_SECONDS = config("HEARTBEAT_TIMEOUT_SECONDS", default=45.0, cast=float)
+
+# Records are handed to a background writer thread when LOG_ENQUEUE is on. Each room may
+# write LOG_ROOM_RATE_PER_SECOND records (bursts of LOG_ROOM_BURST); per-frame debug
+# records are sampled, one in LOG_DEBUG_SAMPLE_EVERY.
+LOG_LEVEL = config("LOG_LEVEL", default="INFO")
+LOG_ENQUEUE = config("LOG_ENQUEUE", default=True, cast=bool)
+LOG_ROOM_RATE_PER_SECOND = config("LOG_ROOM_RATE_PER_SECOND", default=5.0, cast=float)
+LOG_ROOM_BURST = config("LOG_ROOM_BURST", default=50.0, cast=float)
+# 0 or 1 keeps every debug record
+LOG_DEBUG_SAMPLE_EVERY = max(1, config("LOG_DEBUG_SAMPLE_EVERY", default=100, cast=int))
+
+# Read-only spectators per room; their stream is forwarded once per SPECTATOR_FLUSH_SECONDS
+# with player-list changes merged into one full list. A cap of 0 lifts it.
+MAX_SPECTATORS_PER_ROOM = config("MAX_SPECTATORS_PER_ROOM", default=500, cast=int)
+SPECTATOR_FLUSH_SECONDS = config("SPECTATOR_FLUSH_SECONDS", default=0.25, cast=float)
+
+# A status request can wait up to STATUS_WATCH_MAX_SECONDS for its room to change, and a
+# batch status request may ask for up to STATUS_BATCH_LIMIT rooms
+STATUS_WATCH_MAX_SECONDS = config("STATUS_WATCH_MAX_SECONDS", default=30.0, cast=float)
+STATUS_BATCH_LIMIT = config("STATUS_BATCH_LIMIT", default=200, cast=int)
\ No newline at end of file
@@ -1,29 +1,38 @@
-from loguru import logger
-import asyncio
+from fastapi import WebSocket
 
-from .room import GameRoom
+from .room import GameRoom, rooms
 from .player import Player
+from .config import COUNTDOWN_SECONDS, TURN_SECONDS, VOTE_SECONDS
 
 async def ready(room: GameRoom, player: Player):
     room.set_ready(player.player_id)
     
     await room.send_updated_player_list()
     
-    if room.all_ready():
-        asyncio.create_task(start_game_countdown(room))
+    if room.all_ready() and not room.is_started:
+        await start_game_countdown(room)
 
 async def start_game_countdown(room: GameRoom):
-    logger.info(f"All players are ready in room {room.room_id}. Starting the game in 3 seconds.")
+    room.log.info("All players are ready in room {}. Starting the game in {} seconds.", room.room_id, COUNTDOWN_SECONDS)
     
     room.start_game()
     
+    # Sleeping here would hold up every other event in the room's mailbox
+    if COUNTDOWN_SECONDS > 0:
+        room.set_deadline(COUNTDOWN_SECONDS, lambda: room.post(countdown_finished, room))
+    else:
+        room.post(countdown_finished, room)
+    
     await room.send_countdown_start()
     
-    await asyncio.sleep(3)
+async def countdown_finished(room: GameRoom):
+    if rooms.get(room.room_id) is not room or not room.is_started:
+        return
+    
     await start_game(room)
     
 async def start_game(room: GameRoom):
-    logger.info(f"Game started in {room.room_id}. Discussion ongoing.")
+    room.log.info("Game started in {}. Discussion ongoing.", room.room_id)
     
     await room.generate_impostor()
     await room.send_game_start()
@@ -31,6 +40,121 @@ async def start_game(room: GameRoom):
     next_player = room.whos_next()
     
     if next_player:
-        room.start_turn(next_player.player_id)
-        await room.send_updated_player_list()
-        await room.notify_player_their_turn(next_player)
\ No newline at end of file
+        await start_turn(room, next_player)
+        
+async def start_turn(room: GameRoom, player: Player):
+    room.start_turn(player.player_id)
+    room.set_deadline(TURN_SECONDS, lambda: room.post(turn_timed_out, room, player.player_id))
+    
+    await room.send_updated_player_list()
+    await room.notify_player_their_turn(player)
+    
+async def end_turn(room: GameRoom, player: Player):
+    # Only the current speaker ends a turn, so a stray or duplicate end_turn neither skips
+    # a speaker nor clears the countdown or vote deadline instead of the turn's
+    if not player.currently_discussing or not room.is_started or room.is_voting:
+        return
+    
+    room.clear_deadline()
+    room.end_turn(player.player_id)
+    
+    await advance_turn(room)
+    
+async def advance_turn(room: GameRoom):
+    next_player = room.whos_next()
+    
+    if not next_player:
+        await start_voting(room)
+        return
+    
+    await start_turn(room, next_player)
+    
+async def turn_timed_out(room: GameRoom, player_id: str):
+    if rooms.get(room.room_id) is not room:
+        return
+    
+    player = room.players.get(player_id)
+    
+    if not player:
+        # The speaker left without their turn ending; move on unless someone else already has
+        if room.is_started and not room.is_voting and not any(other.currently_discussing for other in room.players.values()):
+            room.log.info("Turn of departed player {} timed out in room {}", player_id, room.room_id)
+            room.clear_deadline()
+            await advance_turn(room)
+        return
+    
+    if not player.currently_discussing:
+        return
+    
+    room.log.info("Turn of {} timed out in room {}", player.player_name, room.room_id)
+    await end_turn(room, player)
+    
+async def drop_unresponsive(room: GameRoom, websocket: WebSocket):
+    player = room.players.get(room.connections.get(websocket, ""))
+    if not player:
+        return
+    
+    was_discussing = player.currently_discussing
+    await room.evict_unresponsive(websocket)
+    await move_on_without(room, was_discussing)
+    
+async def player_left(room: GameRoom, player_id: str):
+    player = room.players.get(player_id)
+    was_discussing = bool(player and player.currently_discussing)
+    
+    await room.leave(player_id)
+    await move_on_without(room, was_discussing)
+    
+async def move_on_without(room: GameRoom, was_discussing: bool):
+    # The rest of the room may only have been waiting on the player who is gone now
+    if rooms.get(room.room_id) is not room:
+        return
+    
+    if room.is_voting:
+        if room.all_voted():
+            await finish_voting(room)
+    elif was_discussing:
+        room.clear_deadline()
+        await advance_turn(room)
+    elif not room.is_started and room.all_ready():
+        await start_game_countdown(room)
+    
+async def start_voting(room: GameRoom):
+    room.is_voting = True
+    room.set_deadline(VOTE_SECONDS, lambda: room.post(voting_timed_out, room))
+    
+    await room.send_updated_player_list()
+    await room.send_voting_start()
+    
+async def finish_voting(room: GameRoom):
+    room.clear_deadline()
+    
+    await room.show_impostor()
+    room.reset_room()
+    
+    await room.send_updated_player_list()
+    
+async def voting_timed_out(room: GameRoom):
+    if rooms.get(room.room_id) is not room or not room.is_voting:
+        return
+    
+    room.log.info("Voting timed out in room {}", room.room_id)
+    await finish_voting(room)
+    
+def restart_deadlines(room: GameRoom):
+    # Deadlines are not checkpointed; a restored game gets a fresh one for the phase it is in
+    if room.is_voting:
+        room.set_deadline(VOTE_SECONDS, lambda: room.post(voting_timed_out, room))
+        return
+    
+    current = next((player for player in room.players.values() if player.currently_discussing), None)
+    
+    if current:
+        room.set_deadline(TURN_SECONDS, lambda: room.post(turn_timed_out, room, current.player_id))
+    elif room.is_started and not room.impostor:
+        if COUNTDOWN_SECONDS > 0:
+            room.set_deadline(COUNTDOWN_SECONDS, lambda: room.post(countdown_finished, room))
+        else:
+            room.post(countdown_finished, room)
+
+GameRoom.departure = player_left
\ No newline at end of file
@@ -0,0 +1,50 @@
+from typing import Annotated, Dict, Literal, Type, Union
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError, create_model
+
+from .wire_format import decode_binary_frame
+
+class EventDecoder:
+    """
+    Parses and validates inbound frames against the payload schema registered for their event.
+
+    All schemas are compiled into a single discriminated union, so pydantic-core parses the
+    JSON, picks the schema by `event` and validates `data` in one pass. Binary frames are
+    MessagePack `[event code, data]` arrays, unpacked first and validated the same way.
+    Anything it cannot decode, including unknown events, raises `pydantic.ValidationError`.
+    """
+    def __init__(self):
+        self.schemas: Dict[str, Type[BaseModel]] = {}
+        self.adapter: Union[TypeAdapter, None] = None
+
+    def register(self, event: str, schema: Type[BaseModel]):
+        self.schemas[event] = schema
+        self.adapter = None
+
+    def compile(self) -> TypeAdapter:
+        frames = tuple(
+            create_model(f"{schema.__name__}Frame",
+                         event=(Literal[event], ...),
+                         data=(schema, Field(default_factory=schema)))
+            for event, schema in self.schemas.items()
+        )
+
+        if len(frames) == 1:
+            return TypeAdapter(frames[0])
+
+        return TypeAdapter(Annotated[Union[frames], Field(discriminator="event")])
+
+    def decode(self, frame: Union[str, bytes]) -> BaseModel:
+        if self.adapter is None:
+            self.adapter = self.compile()
+
+        if isinstance(frame, str):
+            return self.adapter.validate_json(frame)
+
+        try:
+            message = decode_binary_frame(frame)
+        except ValueError as e:
+            raise ValidationError.from_exception_data("BinaryFrame", [
+                {"type": "value_error", "loc": (), "input": frame, "ctx": {"error": e}}
+            ])
+
+        return self.adapter.validate_python(message)
@@ -1,70 +1,90 @@
-from typing import Callable, Dict
+from typing import Callable, Dict, Type
 from fastapi import WebSocket
+from pydantic import BaseModel
 import asyncio
-from loguru import logger
+from time import perf_counter
 
 from .room import GameRoom
 from .player import Player
-from .event_controller import ready
+from .event_controller import ready, end_turn, finish_voting
 from .events import Event
+from .event_decoder import EventDecoder
+from .request_types import EmptyPayload, SetNamePayload, SetImagePayload, SetVotePayload
+from .metrics import HANDLER_SECONDS
 
-event_handlers: Dict[str, Callable[[WebSocket, Dict, GameRoom, Player], None]] = {}
+event_handlers: Dict[str, Callable[[WebSocket, BaseModel, GameRoom, Player], None]] = {}
+event_decoder = EventDecoder()
+# Pongs only prove the connection is alive; the receive loop drops them before dispatch
+event_decoder.register(Event.PONG, EmptyPayload)
 
-def register_event(event_name: str):
-    def decorator(func: Callable[[WebSocket, Dict, GameRoom, Player], None]):
+def register_event(event_name: str, schema: Type[BaseModel] = EmptyPayload):
+    def decorator(func: Callable[[WebSocket, BaseModel, GameRoom, Player], None]):
         event_handlers[event_name] = func
+        event_decoder.register(event_name, schema)
         return func
     return decorator
 
+async def dispatch(message: BaseModel, websocket: WebSocket, room: GameRoom, player: Player):
+    # Runs on the room's mailbox; an earlier job may have removed this connection already
+    if room.connections.get(websocket) != player.player_id:
+        return
+    
+    start = perf_counter()
+    room.touch()
+    
+    await event_handlers[message.event](websocket, message.data, room, player)
+    
+    HANDLER_SECONDS.labels(message.event).observe(perf_counter() - start)
+
 @register_event(Event.SET_READY)
-async def handle_ready(websocket: WebSocket, data: Dict, room: GameRoom, player: Player):
+async def handle_ready(websocket: WebSocket, data: EmptyPayload, room: GameRoom, player: Player):
     await ready(room, player)
     
+@register_event(Event.RESYNC)
+async def handle_resync(websocket: WebSocket, data: EmptyPayload, room: GameRoom, player: Player):
+    await room.send_player_snapshot(player)
+    
 @register_event(Event.REMOVE_READY)
-async def handle_unready(websocket: WebSocket, data: Dict, room: GameRoom, player: Player):
+async def handle_unready(websocket: WebSocket, data: EmptyPayload, room: GameRoom, player: Player):
     room.unready(player.player_id)
     
     await room.send_updated_player_list()
     
-@register_event(Event.SET_NAME)
-async def handle_set_name(websocket: WebSocket, data: Dict, room: GameRoom, player: Player):
-    room.set_name(player.player_id, data.get("new_name", player.player_name))
-    
-    await room.send_updated_player_list()
+@register_event(Event.SET_NAME, SetNamePayload)
+async def handle_set_name(websocket: WebSocket, data: SetNamePayload, room: GameRoom, player: Player):
+    if data.new_name is None:
+        return
     
-@register_event(Event.SET_IMAGE)
-async def handle_set_image(websocket: WebSocket, data: Dict, room: GameRoom, player: Player):
-    room.set_image(player.player_id, data.get("player_image_url", player.player_image_url))
+    room.set_name(player.player_id, data.new_name)
     
     await room.send_updated_player_list()
     
-@register_event(Event.END_TURN)
-async def handle_end_turn(websocket: WebSocket, data: Dict, room: GameRoom, player: Player):
-    logger.info(f"Ending turn of {player.player_name}")
-    room.end_turn(player.player_id)
-    
-    next_player = room.whos_next()
-    
-    if not next_player:
-        await room.send_voting_start()
+@register_event(Event.SET_IMAGE, SetImagePayload)
+async def handle_set_image(websocket: WebSocket, data: SetImagePayload, room: GameRoom, player: Player):
+    if data.player_image_url is None:
         return
     
-    room.start_turn(next_player.player_id)
+    room.set_image(player.player_id, data.player_image_url)
     
     await room.send_updated_player_list()
-    await room.notify_player_their_turn(next_player)
+    
+@register_event(Event.END_TURN)
+async def handle_end_turn(websocket: WebSocket, data: EmptyPayload, room: GameRoom, player: Player):
+    room.log.info("Ending turn of {} in room {}", player.player_name, room.room_id)
+    await end_turn(room, player)
 
-@register_event(Event.SET_VOTE)
-async def handle_vote(websocket: WebSocket, data: Dict, room: GameRoom, player: Player):
-    voted = data.get("voted", "")
+@register_event(Event.SET_VOTE, SetVotePayload)
+async def handle_vote(websocket: WebSocket, data: SetVotePayload, room: GameRoom, player: Player):
+    voted = data.voted
     
     if voted not in room.players.keys():
         return
     
-    room.vote(player.player_id, voted)
+    if not room.vote(player.player_id, voted):
+        return
     
     if room.all_voted():
-        await room.show_impostor()
-        room.reset_room()
+        await finish_voting(room)
+        return
     
     await room.send_updated_player_list()
\ No newline at end of file
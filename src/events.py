@@ -18,4 +18,14 @@ class Event(StrEnum):
     SET_NAME = "set_name"
     END_TURN = "end_turn"
     START_TURN = "start_turn"
-    SET_IMAGE = "set_image"
\ No newline at end of file
+    SET_IMAGE = "set_image"
+    PLAYERS_PATCH = "players_patch"
+    RESYNC = "resync"
+    WRONG_WORKER = "wrong_worker"
+    INVALID_MESSAGE = "invalid_message"
+    SESSION_RESUMED = "session_resumed"
+    RATE_LIMITED = "rate_limited"
+    SERVER_BUSY = "server_busy"
+    PING = "ping"
+    PONG = "pong"
+    SPECTATING = "spectating"
\ No newline at end of file
@@ -1,4 +1,5 @@
 from pydantic import BaseModel
+from enum import StrEnum
 
 class GameWord(BaseModel):
     is_impostor: bool
@@ -6,4 +7,9 @@ class GameWord(BaseModel):
 
 class WordClue(BaseModel):
     word: str
-    clue: str
\ No newline at end of file
+    clue: str
+
+class RoomStatus(StrEnum):
+    INVALID = "INVALID"
+    STARTED = "STARTED"
+    WAITING = "WAITING"
\ No newline at end of file
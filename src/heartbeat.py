@@ -0,0 +1,126 @@
+from array import array
+from typing import List, Union
+import asyncio
+from time import monotonic, perf_counter
+from loguru import logger
+
+from .room import GameRoom
+from .outbound_queue import OutboundQueue
+from .broadcast_message import BroadcastMessage
+from .events import Event
+from .event_controller import drop_unresponsive
+from .metrics import Counter, Gauge, Histogram
+from .config import HEARTBEAT_INTERVAL_SECONDS, HEARTBEAT_TIMEOUT_SECONDS
+
+SWEEP_SECONDS = Histogram("balatkayo_heartbeat_sweep_seconds", "Time spent on the event loop by one heartbeat sweep",
+                          buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0))
+UNRESPONSIVE_EVICTED = Counter("balatkayo_unresponsive_evicted_total", "Connections evicted after missing their heartbeats")
+
+# Connections pinged before yielding back to the event loop; a sweep spreads its
+# batches over SWEEP_SPREAD of the interval rather than running them back to back
+SWEEP_BATCH = 256
+SWEEP_SPREAD = 0.5
+
+# One frame for every ping; only its encoding per wire format is cached
+PING = BroadcastMessage(Event.PING, {}, sequenced=False)
+
+class Heartbeat:
+    """
+    Application-level ping/pong for every connection that asked for it, from one task.
+
+    Connections live in slots: the last time anything was heard from a slot sits in a
+    flat array of doubles, next to the connection's outbound queue and room. Any inbound
+    frame counts as a sign of life, pongs included, and recording one is an array store.
+    Every interval the sweeper walks the slots in small batches paced over half the
+    interval, so neither the sweep nor the writers it wakes hold the loop for long: a
+    slot silent for longer than the timeout is evicted through its room's mailbox, any
+    other gets a ping coalesced into its outbound queue, so a client that is only slow
+    never has pings pile up. Freed slots are reused, so the arrays only grow to the peak
+    number of connections.
+    """
+    def __init__(self, interval: float = HEARTBEAT_INTERVAL_SECONDS, timeout: float = HEARTBEAT_TIMEOUT_SECONDS):
+        self.interval = interval
+        self.timeout = timeout
+        self.last_seen = array("d")
+        self.queues: List[Union[OutboundQueue, None]] = []
+        self.rooms: List[Union[GameRoom, None]] = []
+        self.free: List[int] = []
+        self.tracked = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.interval > 0 and self.timeout > 0
+
+    def register(self, room: GameRoom, queue: OutboundQueue) -> int:
+        if self.free:
+            slot = self.free.pop()
+            self.last_seen[slot] = monotonic()
+            self.queues[slot] = queue
+            self.rooms[slot] = room
+        else:
+            slot = len(self.queues)
+            self.last_seen.append(monotonic())
+            self.queues.append(queue)
+            self.rooms.append(room)
+
+        self.tracked += 1
+        return slot
+
+    def seen(self, slot: int, queue: OutboundQueue):
+        # The queue check keeps a connection from refreshing a slot that was handed on
+        if self.queues[slot] is queue:
+            self.last_seen[slot] = monotonic()
+
+    def forget(self, slot: int, queue: OutboundQueue):
+        if self.queues[slot] is queue:
+            self.release(slot)
+
+    def release(self, slot: int):
+        self.queues[slot] = None
+        self.rooms[slot] = None
+        self.free.append(slot)
+        self.tracked -= 1
+
+    async def sweep(self):
+        loop_time = 0.0
+        start = perf_counter()
+        now = monotonic()
+        last_seen = self.last_seen
+        queues = self.queues
+        pause = self.interval * SWEEP_SPREAD / (len(queues) // SWEEP_BATCH + 1)
+
+        for slot in range(len(queues)):
+            if slot and slot % SWEEP_BATCH == 0:
+                loop_time += perf_counter() - start
+                await asyncio.sleep(pause)
+                start = perf_counter()
+
+            queue = queues[slot]
+            if queue is None:
+                continue
+
+            if queue.closed:
+                # Its room already let go of the connection (left, resumed elsewhere, evicted)
+                self.release(slot)
+            elif now - last_seen[slot] > self.timeout:
+                room = self.rooms[slot]
+                self.release(slot)
+                room.post(drop_unresponsive, room, queue.websocket)
+                UNRESPONSIVE_EVICTED.inc()
+            else:
+                queue.put(PING.encode(queue.wire_format), Event.PING)
+
+        SWEEP_SECONDS.observe(loop_time + perf_counter() - start)
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+
+            try:
+                await self.sweep()
+            except Exception as e:
+                logger.exception("Heartbeat sweep failed: {}", e)
+
+heartbeat = Heartbeat()
+
+Gauge("balatkayo_heartbeat_connections", "Connections tracked by the heartbeat sweeper", lambda: heartbeat.tracked)
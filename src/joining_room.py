@@ -1,38 +1,71 @@
-from fastapi import WebSocket
-import json
-from typing import Dict
+from fastapi import WebSocket, WebSocketDisconnect
+from pydantic import ValidationError
+from typing import Tuple, Union
 import uuid
 from loguru import logger
 
 from .player import Player
-from .config import DEFAULT_PLAYER_IMAGE
 from .room import rooms
 from .broadcast_message import default_messages, DefaultMessage
 from .events import Event
 from .name_generator import generate_random_name
+from .broadcast_message import BroadcastMessage
+from .sharding import owner_of, worker_url
+from .config import WORKER_INDEX
+from .event_decoder import EventDecoder
+from .request_types import IdentifyPayload
+from .admission import reject
 
-async def identify(websocket: WebSocket) -> bool:
-    message_json = await websocket.receive_text()
-    message = json.loads(message_json)
+identify_decoder = EventDecoder()
+identify_decoder.register(Event.IDENTIFY, IdentifyPayload)
+
+async def identify(websocket: WebSocket) -> Union[Tuple[Player, IdentifyPayload], None]:
+    try:
+        frame = await receive_frame(websocket)
+    except WebSocketDisconnect:
+        return None
     
-    logger.info(f"Identifying: {message}")
+    # The handshake is always JSON; it picks the wire format for everything after it
+    if not isinstance(frame, str):
+        logger.info("Rejected binary identify frame")
+        await websocket.send_text(default_messages[DefaultMessage.INVALID_MESSAGE].frame)
+        # 1003 is "unsupported data"
+        await websocket.close(code=1003)
+        return None
     
-    if message.get('event') == Event.IDENTIFY:
-        player = await handle_identify(websocket, message['data'])
-        
-        return player
-    else:
+    try:
+        message = identify_decoder.decode(frame)
+    except ValidationError as e:
+        logger.info("Rejected identify frame: {} errors", e.error_count())
         await websocket.close()
         return
+    
+    # The whole payload is only rendered when debug logging is on
+    logger.debug("Identifying: {}", message)
+    
+    player = await handle_identify(websocket, message.data)
+    
+    return player, message.data
 
-async def handle_identify(websocket: WebSocket, message_data: Dict) -> Player:
+async def receive_frame(websocket: WebSocket) -> Union[str, bytes]:
+    # Text frames carry JSON and binary frames MessagePack, whatever was negotiated
+    message = await websocket.receive()
+    
+    if message["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(message.get("code", 1000))
+    
+    if message.get("text") is not None:
+        return message["text"]
+    
+    return message.get("bytes") or b""
+    
+async def handle_identify(websocket: WebSocket, message_data: IdentifyPayload) -> Player:
     player_id = str(uuid.uuid4())
-    player_name = message_data.get("player_name", "")
+    player_name = message_data.player_name
     player_name = generate_random_name() if player_name == "" else player_name
-    player_image_url = message_data.get("player_image_url", DEFAULT_PLAYER_IMAGE)
+    player_image_url = message_data.player_image_url
     
     player = Player(player_id=player_id,
-                    websocket=websocket, 
                     player_name=player_name, 
                     player_image_url=player_image_url,
                     is_ready=False,
@@ -43,11 +76,31 @@ async def handle_identify(websocket: WebSocket, message_data: Dict) -> Player:
     
     return player
     
+async def redirect_to_owner(websocket: WebSocket, room_id: str, owner: int):
+    url = worker_url(owner).replace("http", "ws", 1) + f"/ws/game/{room_id}"
+    message = BroadcastMessage(Event.WRONG_WORKER, {"url": url})
+    
+    await websocket.send_text(message.frame)
+    # 4000-4999 is reserved for applications; 4307 mirrors HTTP's temporary redirect
+    await websocket.close(code=4307)
+    
 async def validate_room(websocket: WebSocket, room_id: str) -> bool:
+    owner = owner_of(room_id)
+    if owner is not None and owner != WORKER_INDEX:
+        await redirect_to_owner(websocket, room_id, owner)
+        return False
+    
     if room_id not in rooms:
-        websocket.send(json.dumps(default_messages[DefaultMessage.INVALID_ROOM_ID]))
+        await websocket.send_text(default_messages[DefaultMessage.INVALID_ROOM_ID].frame)
         
         await websocket.close()
         return False
     
-    return True
\ No newline at end of file
+    return True
+    
+async def refuse(websocket: WebSocket, reason: str):
+    message = BroadcastMessage(Event.SERVER_BUSY, reject(reason), sequenced=False)
+    
+    await websocket.send_text(message.frame)
+    # 1013 is "try again later"; the frame above says when
+    await websocket.close(code=1013)
\ No newline at end of file
@@ -0,0 +1,74 @@
+import sys
+from time import monotonic
+from loguru import logger
+
+from .admission import TokenBucket
+from .config import LOG_LEVEL, LOG_ENQUEUE, LOG_ROOM_RATE_PER_SECOND, LOG_ROOM_BURST, LOG_DEBUG_SAMPLE_EVERY
+
+# Numeric level below which calls return before loguru builds a record; set by configure_logging
+min_level = logger.level(LOG_LEVEL).no
+
+def configure_logging(level: str = LOG_LEVEL, enqueue: bool = LOG_ENQUEUE, sink=sys.stderr):
+    """
+    Sends every record to `sink` through a queue drained by loguru's writer thread, so
+    the event loop never waits on the terminal or a log collector. Call `logger.complete()`
+    on shutdown to flush what is still queued.
+    """
+    global min_level
+
+    logger.remove()
+    logger.add(sink, level=level, enqueue=enqueue, backtrace=False, diagnose=False)
+    min_level = logger.level(level).no
+
+class RoomLogger:
+    """
+    Logging for one room's hot paths, with the cost paid only by what gets written.
+
+    Messages use loguru's brace style with the values as arguments, so nothing is
+    formatted unless the record passes the level. Debug calls below the configured level
+    return after one comparison; above it, one in `sample_every` is kept. Whatever is
+    left shares a token bucket per room, so one busy or abusive room cannot flood the
+    sink; the next record that gets through says how many were dropped.
+    """
+    __slots__ = ("room_id", "bucket", "suppressed", "calls", "sample_every")
+
+    def __init__(self, room_id: str,
+                 rate: float = LOG_ROOM_RATE_PER_SECOND,
+                 burst: float = LOG_ROOM_BURST,
+                 sample_every: int = LOG_DEBUG_SAMPLE_EVERY):
+        self.room_id = room_id
+        self.bucket = TokenBucket(rate, burst, monotonic())
+        self.suppressed = 0
+        self.calls = 0
+        self.sample_every = sample_every
+
+    def debug(self, message: str, *args):
+        if min_level > 10:
+            return
+
+        self.calls += 1
+        if self.calls % self.sample_every:
+            return
+
+        self.log("DEBUG", 10, message, args)
+
+    def info(self, message: str, *args):
+        self.log("INFO", 20, message, args)
+
+    def warning(self, message: str, *args):
+        self.log("WARNING", 30, message, args)
+
+    def log(self, level: str, number: int, message: str, args: tuple):
+        if number < min_level:
+            return
+
+        if not self.bucket.take(monotonic()):
+            self.suppressed += 1
+            return
+
+        if self.suppressed:
+            message = f"{message} ({self.suppressed} earlier messages from room {self.room_id} dropped)"
+            self.suppressed = 0
+
+        # Attributes the record to whoever called debug/info/warning
+        logger.opt(depth=2).log(level, message, *args)
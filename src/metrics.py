@@ -0,0 +1,137 @@
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from typing import Callable, Dict, List, Tuple, Union
+
+# Upper bounds in seconds, from 10µs to 2.5s
+DEFAULT_BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+                   0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+registry: List["Metric"] = []
+
+def format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{value}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+class Metric(ABC):
+    kind = ""
+
+    def __init__(self, name: str, help: str, label_names: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.label_names = label_names
+        registry.append(self)
+
+    @abstractmethod
+    def samples(self) -> List[str]:
+        ...
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+class HistogramSeries:
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+class Histogram(Metric):
+    """Fixed-bucket histogram; observing is a bisect and three additions."""
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, label_names: Tuple[str, ...] = (), buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, help, label_names)
+        self.buckets = buckets
+        self.series: Dict[Tuple[str, ...], HistogramSeries] = {}
+        self.default = self.labels() if not label_names else None
+
+    def labels(self, *values: str) -> HistogramSeries:
+        series = self.series.get(values)
+
+        if series is None:
+            series = self.series[values] = HistogramSeries(self.buckets)
+
+        return series
+
+    def remove(self, *values: str):
+        self.series.pop(values, None)
+
+    def observe(self, value: float):
+        self.default.observe(value)
+
+    def samples(self) -> List[str]:
+        lines = []
+
+        for values, series in self.series.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets, series.counts):
+                cumulative += count
+                bucket = format_labels(self.label_names, values, 'le="%s"' % bound)
+                lines.append(f"{self.name}_bucket{bucket} {cumulative}")
+
+            bucket = format_labels(self.label_names, values, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{bucket} {series.count}")
+            lines.append(f"{self.name}_sum{format_labels(self.label_names, values)} {series.sum}")
+            lines.append(f"{self.name}_count{format_labels(self.label_names, values)} {series.count}")
+
+        return lines
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str):
+        super().__init__(name, help)
+        self.value = 0
+
+    def inc(self, amount: int = 1):
+        self.value += amount
+
+    def samples(self) -> List[str]:
+        return [f"{self.name} {self.value}"]
+
+class Gauge(Metric):
+    """
+    Either set directly or read from `function` at scrape time. With `label_names`,
+    `function` returns a value per tuple of label values instead of a single value.
+    """
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, function: Union[Callable[[], float], None] = None, label_names: Tuple[str, ...] = ()):
+        super().__init__(name, help, label_names)
+        self.function = function
+        self.value = 0
+
+    def inc(self, amount: int = 1):
+        self.value += amount
+
+    def dec(self, amount: int = 1):
+        self.value -= amount
+
+    def samples(self) -> List[str]:
+        if self.label_names:
+            return [f"{self.name}{format_labels(self.label_names, values)} {value}"
+                    for values, value in self.function().items()]
+
+        value = self.function() if self.function else self.value
+        return [f"{self.name} {value}"]
+
+def render_metrics() -> str:
+    return "\n".join(metric.render() for metric in registry) + "\n"
+
+HANDLER_SECONDS = Histogram("balatkayo_handler_seconds", "Time spent in an event handler", ("event",))
+ENCODE_SECONDS = Histogram("balatkayo_broadcast_encode_seconds", "Time spent encoding a broadcast frame")
+FAN_OUT_SECONDS = Histogram("balatkayo_fan_out_seconds", "Time spent handing a frame to every recipient in a room")
+SEND_SECONDS = Histogram("balatkayo_socket_send_seconds", "Time spent in websocket send_text per frame")
+OPEN_CONNECTIONS = Gauge("balatkayo_open_connections", "Websocket connections currently open")
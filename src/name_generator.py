@@ -1,11 +1,17 @@
-from .config import STATIC_DIR
+from functools import cache
 import random
 
-with open(STATIC_DIR / 'adjectives.txt', 'r') as file:
-    adjectives = [word.strip() for word in file.readlines()]
+from .static_assets import Asset, names_asset
 
-with open(STATIC_DIR / 'nouns.txt', 'r') as file:
-    nouns = [word.strip() for word in file.readlines()]
+@cache
+def name_parts() -> Asset:
+    return names_asset()
     
 def generate_random_name() -> str:
-    return f"{random.choice(adjectives)} {random.choice(nouns)}"
\ No newline at end of file
+    parts = name_parts()
+    adjectives = parts.ints[0]
+    
+    adjective = parts.string(random.randrange(adjectives))
+    noun = parts.string(random.randrange(adjectives, parts.count))
+    
+    return f"{adjective} {noun}"
\ No newline at end of file
@@ -0,0 +1,128 @@
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Union
+import asyncio
+from time import perf_counter
+from fastapi import WebSocket
+from loguru import logger
+
+from .config import OUTBOUND_QUEUE_HIGH_WATER, OUTBOUND_QUEUE_LIMIT, OUTBOUND_QUEUE_GRACE_SECONDS
+from .metrics import SEND_SECONDS
+from .wire_format import WireFormat
+
+class OutboundQueue:
+    """
+    Bounded queue of encoded frames for one connection, drained by its own writer task.
+
+    Frames that share a coalesce key replace the one still waiting in the queue, so a
+    slow client only ever receives the latest of them. A client that stays above the
+    high-water mark for longer than the grace period, or goes past the hard limit, is
+    handed to `on_evict`. Frames are already encoded in the connection's `wire_format`;
+    bytes go out as binary websocket messages and strings as text.
+    """
+    def __init__(self,
+                 websocket: WebSocket,
+                 on_evict: Callable[[WebSocket], None],
+                 wire_format: WireFormat = WireFormat.JSON,
+                 high_water: int = OUTBOUND_QUEUE_HIGH_WATER,
+                 limit: int = OUTBOUND_QUEUE_LIMIT,
+                 grace_seconds: float = OUTBOUND_QUEUE_GRACE_SECONDS):
+        self.websocket = websocket
+        self.on_evict = on_evict
+        self.wire_format = wire_format
+        self.high_water = high_water
+        self.limit = limit
+        self.grace_seconds = grace_seconds
+
+        # Entries are [frame, coalesce_key]; a coalesced entry has its frame blanked
+        # instead of being removed from the middle of the deque.
+        self.entries: Deque[List] = deque()
+        self.coalesced: Dict[str, List] = {}
+        self.depth = 0
+        self.over_since: Optional[float] = None
+        self.closed = False
+
+        self.wakeup = asyncio.Event()
+        self.writer = asyncio.create_task(self.drain())
+
+    def put(self, frame: Union[str, bytes], coalesce_key: Optional[str] = None):
+        if self.closed:
+            return
+
+        if coalesce_key:
+            stale = self.coalesced.pop(coalesce_key, None)
+
+            if stale:
+                stale[0] = None
+                self.depth -= 1
+
+        entry = [frame, coalesce_key]
+        self.entries.append(entry)
+        self.depth += 1
+
+        if coalesce_key:
+            self.coalesced[coalesce_key] = entry
+
+        self.wakeup.set()
+        self.check_backpressure()
+
+    def check_backpressure(self):
+        if self.depth <= self.high_water:
+            self.over_since = None
+            return
+
+        now = asyncio.get_running_loop().time()
+
+        if self.over_since is None:
+            self.over_since = now
+
+        if self.depth > self.limit or now - self.over_since > self.grace_seconds:
+            logger.warning("Evicting slow consumer with {} frames queued", self.depth)
+            self.evict()
+
+    def evict(self):
+        if self.closed:
+            return
+
+        self.close()
+        self.on_evict(self.websocket)
+
+    async def drain(self):
+        while True:
+            while not self.entries:
+                self.wakeup.clear()
+                await self.wakeup.wait()
+
+            entry = self.entries.popleft()
+            frame, coalesce_key = entry
+
+            if frame is None:
+                continue
+
+            self.depth -= 1
+
+            if coalesce_key and self.coalesced.get(coalesce_key) is entry:
+                del self.coalesced[coalesce_key]
+
+            try:
+                start = perf_counter()
+                if isinstance(frame, bytes):
+                    await self.websocket.send_bytes(frame)
+                else:
+                    await self.websocket.send_text(frame)
+                SEND_SECONDS.observe(perf_counter() - start)
+            except Exception as e:
+                logger.warning("Something went wrong when sending message to player! {}", e)
+                self.evict()
+                return
+
+            if self.depth <= self.high_water:
+                self.over_since = None
+
+    def close(self):
+        self.closed = True
+        self.entries.clear()
+        self.coalesced.clear()
+        self.depth = 0
+
+        if self.writer is not asyncio.current_task():
+            self.writer.cancel()
@@ -1,13 +1,48 @@
-from pydantic import BaseModel, ConfigDict
-from fastapi import WebSocket
+from dataclasses import dataclass, field, fields
+from typing import Any, Dict, Union
 
-class Player(BaseModel):
-    model_config = ConfigDict(arbitrary_types_allowed=True)
+@dataclass(slots=True, eq=False)
+class Player:
+    """
+    Player state without its connection; the room maps player IDs to websockets.
+
+    Change fields through `update` so the cached wire form is rebuilt only when
+    something actually changed.
+    """
     player_id : str
-    websocket : WebSocket
     player_name : str
     player_image_url : str
-    is_ready: bool
-    turn_ended: bool
-    has_voted: bool
-    currently_discussing: bool
\ No newline at end of file
+    is_ready: bool = False
+    turn_ended: bool = False
+    has_voted: bool = False
+    currently_discussing: bool = False
+    _wire: Union[Dict[str, Any], None] = field(default=None, repr=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        # Shared between every frame that carries this player; treat it as read-only
+        if self._wire is None:
+            self._wire = {name: getattr(self, name) for name in WIRE_FIELDS}
+        
+        return self._wire
+    
+    def update(self, **changes) -> Dict[str, Any]:
+        changed = {name: value for name, value in changes.items() if getattr(self, name) != value}
+        
+        if changed:
+            for name, value in changed.items():
+                setattr(self, name, value)
+                
+            self._wire = None
+            
+        return changed
+    
+    def set_name(self, new_name: str) -> Dict[str, Any]:
+        return self.update(player_name=new_name)
+    
+    def set_image(self, new_image: str) -> Dict[str, Any]:
+        return self.update(player_image_url=new_image)
+    
+    def set_ready(self, is_ready: bool) -> Dict[str, Any]:
+        return self.update(is_ready=is_ready)
+
+WIRE_FIELDS = tuple(player_field.name for player_field in fields(Player) if not player_field.name.startswith("_"))
\ No newline at end of file
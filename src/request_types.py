@@ -1,4 +1,39 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+from typing import List, Union
+
+from .config import DEFAULT_PLAYER_IMAGE
+from .word_generator import DEFAULT_DECK
+from .wire_format import WireFormat
+from .config import STATUS_BATCH_LIMIT
 
 class CreateRoomRequest(BaseModel):
-    numberOfRounds: int
\ No newline at end of file
+    numberOfRounds: int
+    deck: str = DEFAULT_DECK
+    category: Union[str, None] = None
+
+class RoomStatusBatchRequest(BaseModel):
+    room_ids: List[str] = Field(max_length=STATUS_BATCH_LIMIT)
+
+class EmptyPayload(BaseModel):
+    pass
+
+class IdentifyPayload(BaseModel):
+    player_name: str = Field(default="", max_length=64)
+    player_image_url: str = Field(default=DEFAULT_PLAYER_IMAGE, max_length=2048)
+    encoding: WireFormat = WireFormat.JSON
+    # Set when reconnecting: the token from player_joined and the last seq received
+    resume_token: Union[str, None] = Field(default=None, max_length=64)
+    last_seq: int = Field(default=0, ge=0)
+    # Answers ping with pong; such connections are evicted once they stop answering
+    heartbeat: bool = False
+    # Watch the room read-only instead of joining it as a player
+    spectate: bool = False
+
+class SetNamePayload(BaseModel):
+    new_name: Union[str, None] = Field(default=None, max_length=64)
+
+class SetImagePayload(BaseModel):
+    player_image_url: Union[str, None] = Field(default=None, max_length=2048)
+
+class SetVotePayload(BaseModel):
+    voted: str = ""
\ No newline at end of file
@@ -1,65 +1,386 @@
-from typing import Dict, List, Union
-import json
+from typing import Dict, List, Tuple, Union
 from loguru import logger
 import asyncio
 import random
+import secrets
+from time import perf_counter, monotonic
 from fastapi import WebSocket
 
 from .player import Player
 from .broadcast_message import BroadcastMessage
 from .events import Event
-from .game_types import GameWord
-from .word_generator import generate_random_word
+from .game_types import GameWord, RoomStatus
+from .word_generator import WordCursor, word_bank
+from .outbound_queue import OutboundQueue
+from .config import OUTBOUND_CLOSE_TIMEOUT_SECONDS, EMPTY_ROOM_TTL_SECONDS, IDLE_ROOM_TTL_SECONDS, TURN_SECONDS, VOTE_SECONDS, STATE_FLUSH_TICK_SECONDS
+from .config import RESUME_GRACE_SECONDS, RESUME_BUFFER_FRAMES, MAX_SPECTATORS_PER_ROOM
+from .room_state import PlayerPatchLog, FrameLog
+from .room_registry import room_registry
+from .metrics import Gauge, FAN_OUT_SECONDS
+from .scheduler import TimerHandle, scheduler, run_in_background
+from .wire_format import WireFormat
+from .room_mailbox import RoomMailbox, Job
+from .admission import room_is_full
+from .logs import RoomLogger
+from .spectators import SpectatorFeed
+from .room_status import status_board
+
+# Player flags the room keeps running totals of, so its predicates never scan players
+COUNTED_FIELDS = ("is_ready", "turn_ended", "has_voted")
 
 class GameRoom:
-    def __init__(self, room_id, number_of_rounds = 3):
+    # Applied as `(room, player_id)` when a player leaves for good, on disconnecting or
+    # once their grace window runs out; the event controller installs one that also moves
+    # the game on without them
+    departure: Job
+    
+    def __init__(self, room_id, number_of_rounds = 3, words: Union[WordCursor, None] = None, flush_tick: float = STATE_FLUSH_TICK_SECONDS):
         self.room_id = room_id
         self.players: Dict[str, Player] = {}
         self.connections: Dict[WebSocket, str] = {}
+        self.outbound: Dict[str, OutboundQueue] = {}
         self.is_started = False
-        self.gamer_timer = None
+        self.is_voting = False
+        self.deadline: Union[TimerHandle, None] = None
         self.votes: Dict[str, List[str]] = {}
+        self.counts: Dict[str, int] = dict.fromkeys(COUNTED_FIELDS, 0)
         self.impostor = ""
         self.the_word = ""
         self.order = []
         self.number_of_rounds = number_of_rounds
+        self.words = words or word_bank.cursor()
+        self.player_patches = PlayerPatchLog()
+        self.flush_tick = flush_tick
+        self.pending_flush: Union[TimerHandle, None] = None
+        self.last_activity = monotonic()
+        self.mailbox = RoomMailbox(room_id)
+        self.frames = FrameLog(RESUME_BUFFER_FRAMES)
+        self.resume_tokens: Dict[str, str] = {}
+        self.tokens_by_player: Dict[str, str] = {}
+        # Players whose socket dropped, with the deadline for resuming their slot
+        self.away: Dict[str, TimerHandle] = {}
+        self.log = RoomLogger(room_id)
+        self.spectators = SpectatorFeed(self.spectator_snapshot)
+        
+    def post(self, job: Job, *args):
+        self.mailbox.post(job, *args)
+        
+    async def call(self, job: Job, *args):
+        return await self.mailbox.call(job, *args)
+        
+    def set_deadline(self, seconds: float, callback):
+        self.clear_deadline()
+        
+        if seconds > 0:
+            self.deadline = scheduler.call_later(seconds, callback)
+            
+    def clear_deadline(self):
+        if self.deadline:
+            self.deadline.cancel()
+            self.deadline = None
+        
+    def touch(self):
+        self.last_activity = monotonic()
         
-    def add_player(self, player: Player):
+    def expires_at(self) -> float:
+        ttl = IDLE_ROOM_TTL_SECONDS if self.players else EMPTY_ROOM_TTL_SECONDS
+        return self.last_activity + ttl
+        
+    def add_player(self, player: Player, websocket: WebSocket, wire_format: WireFormat = WireFormat.JSON):
         self.players[player.player_id] = player
-        self.connections[player.websocket] = player.player_id
+        self.count_player(player, 1)
+        self.publish_status()
+        self.touch()
+        self.player_patches.added(player.player_id, player.to_dict())
+        
+        token = secrets.token_urlsafe(18)
+        self.resume_tokens[token] = player.player_id
+        self.tokens_by_player[player.player_id] = token
+        
+        self.attach(player.player_id, websocket, wire_format)
+        
+    def attach(self, player_id: str, websocket: WebSocket, wire_format: WireFormat):
+        self.connections[websocket] = player_id
+        self.outbound[player_id] = OutboundQueue(websocket, self.evict_slow_consumer, wire_format)
+        
+    def detach(self, websocket: WebSocket) -> Union[str, None]:
+        player_id = self.connections.pop(websocket, None)
+        if not player_id:
+            logger.warning("Tried to remove a websocket that wasn't in connections")
+            return None
+        
+        queue = self.outbound.pop(player_id, None)
+        if queue:
+            queue.close()
+            
+        return player_id
     
     def remove_player(self, websocket: WebSocket):
-        player_id = self.connections.pop(websocket, None)
+        player_id = self.detach(websocket)
         if player_id:
-            player = self.players.pop(player_id, None)
-            self.votes.pop(player_id, None)
-
-            logger.info(f"Player {player_id} removed from room {self.room_id}")
+            self.forget_player(player_id)
             
+        return player_id
+    
+    def forget_player(self, player_id: str):
+        player = self.players.pop(player_id, None)
+        if player:
+            self.count_player(player, -1)
+            self.publish_status()
+        self.touch()
+        self.votes.pop(player_id, None)
+        self.player_patches.removed(player_id)
+        
+        self.resume_tokens.pop(self.tokens_by_player.pop(player_id, ""), None)
+        handle = self.away.pop(player_id, None)
+        if handle:
+            handle.cancel()
+
+        self.log.info("Player {} removed from room {}", player_id, self.room_id)
+        
+    async def disconnect(self, websocket: WebSocket) -> Union[str, None]:
+        player_id = self.detach(websocket)
+        if not player_id:
+            return None
+        
+        if RESUME_GRACE_SECONDS > 0 and player_id in self.players:
+            # Keep the slot; the player is removed only if they do not resume in time
+            self.log.info("Player {} dropped from room {}, holding their slot", player_id, self.room_id)
+            self.hold_slot(player_id)
             return player_id
+        
+        await GameRoom.departure(self, player_id)
+        return player_id
+    
+    def hold_slot(self, player_id: str):
+        self.away[player_id] = scheduler.call_later(RESUME_GRACE_SECONDS, lambda: self.post(self.expire_session, player_id))
+    
+    async def expire_session(self, player_id: str):
+        if self.away.pop(player_id, None) is None:
+            return
+        
+        await GameRoom.departure(self, player_id)
+        
+    async def leave(self, player_id: str):
+        self.forget_player(player_id)
+        
+        await self.notify_disconnect(player_id)
+        await self.send_updated_player_list()
+        self.delete_if_empty()
+        
+    def delete_if_empty(self):
+        if len(self.players.keys()) == 0 and rooms.get(self.room_id) is self:
+            delete_room(self.room_id)
+            logger.info("Room {} is empty, deleting it", self.room_id)
+            
+            if self.spectators:
+                run_in_background(self.close())
+            
+    async def add_spectator(self, websocket: WebSocket, wire_format: WireFormat = WireFormat.JSON) -> bool:
+        if MAX_SPECTATORS_PER_ROOM > 0 and len(self.spectators) >= MAX_SPECTATORS_PER_ROOM:
+            return False
+        
+        queue = self.spectators.add(websocket, wire_format, self.evict_slow_spectator)
+        welcome = BroadcastMessage(Event.SPECTATING, {"room_id": self.room_id,
+                                                      "status": self.status,
+                                                      "is_voting": self.is_voting,
+                                                      "spectators": len(self.spectators)}, sequenced=False)
+        
+        queue.put(welcome.encode(wire_format))
+        queue.put(self.spectator_snapshot().encode(wire_format))
+        self.log.debug("Spectator joined room {}, now {} spectators", self.room_id, len(self.spectators))
+        return True
+        
+    async def remove_spectator(self, websocket: WebSocket):
+        self.spectators.remove(websocket)
+        
+    def evict_slow_spectator(self, websocket: WebSocket):
+        self.post(self.evict_spectator, websocket)
+        
+    async def evict_spectator(self, websocket: WebSocket):
+        if self.spectators.remove(websocket):
+            self.log.warning("Evicted slow spectator from room {}", self.room_id)
+            run_in_background(self.close_socket(websocket, 1008))
+            
+    def spectator_snapshot(self) -> BroadcastMessage:
+        players = [player.to_dict() for player in self.players.values()]
+        return BroadcastMessage(Event.UPDATED_PLAYERS_LIST, {"players": players, "seq": self.player_patches.version}, sequenced=False)
+            
+    async def evict_unresponsive(self, websocket: WebSocket) -> Union[str, None]:
+        # Missed its heartbeats: the socket is most likely half-open, so there is nothing to resume
+        if websocket not in self.connections:
+            return None
+        
+        player_id = self.remove_player(websocket)
+        self.log.warning("Evicted unresponsive player {} from room {}", player_id, self.room_id)
+        
+        await self.notify_disconnect(player_id)
+        await self.send_updated_player_list()
+        self.delete_if_empty()
+        
+        run_in_background(self.close_socket(websocket, 4408))
+        return player_id
+            
+    async def resume(self, websocket: WebSocket, token: str, last_seq: int, wire_format: WireFormat = WireFormat.JSON) -> Union[Player, None]:
+        player = self.players.get(self.resume_tokens.get(token, ""))
+        if not player:
+            return None
+        
+        handle = self.away.pop(player.player_id, None)
+        if handle:
+            handle.cancel()
+        
+        stale = self.outbound.get(player.player_id)
+        if stale:
+            # The old socket has not noticed it is gone yet; the new one takes over
+            self.detach(stale.websocket)
+            run_in_background(self.close_socket(stale.websocket, 4409))
+            
+        self.attach(player.player_id, websocket, wire_format)
+        self.touch()
+        
+        missed = self.frames.since(last_seq, player.player_id)
+        self.log.info("Player {} resumed in room {} after seq {}", player.player_id, self.room_id, last_seq)
+        
+        if missed is None:
+            await self.send_player_snapshot(player)
         else:
-            logger.warning("Tried to remove a websocket that wasn't in connections")
+            for message in missed:
+                self.send_frame(player, message)
+        
+        message = BroadcastMessage(Event.SESSION_RESUMED, {"current_player": player.to_dict(),
+                                                           "resume_token": token,
+                                                           "replayed": missed is not None})
+        await self.send_to_player(player, message)
+        
+        return player
+    
+    def evict_slow_consumer(self, websocket: WebSocket):
+        self.post(self.evict, websocket)
+        
+    async def evict(self, websocket: WebSocket):
+        player_id = await self.disconnect(websocket)
+        self.log.warning("Evicted slow consumer {} from room {}", player_id, self.room_id)
+        
+        # A stuck client can take the whole timeout to close; keep that off the mailbox
+        run_in_background(self.close_socket(websocket, 1008))
             
-        return None
+    async def close_socket(self, websocket: WebSocket, code: int):
+        try:
+            await asyncio.wait_for(websocket.close(code=code), timeout=OUTBOUND_CLOSE_TIMEOUT_SECONDS)
+        except Exception as e:
+            logger.warning("Could not close websocket cleanly: {}", e)
+            
+    async def close(self, code: int = 1001):
+        for websocket in list(self.connections) + list(self.spectators.queues):
+            await self.close_socket(websocket, code)
+        
+        self.spectators.close()
+        
+    def snapshot(self) -> Dict:
+        # Copies of everything mutable: the caller encodes it off the event loop. Frame
+        # entries are shared as they are, since sent messages never change.
+        return {
+            "room_id": self.room_id,
+            "number_of_rounds": self.number_of_rounds,
+            "is_started": self.is_started,
+            "is_voting": self.is_voting,
+            "impostor": self.impostor,
+            "the_word": self.the_word,
+            "order": list(self.order),
+            "votes": {voted: list(voters) for voted, voters in self.votes.items()},
+            "players": [player.to_dict() for player in self.players.values()],
+            "resume_tokens": dict(self.tokens_by_player),
+            "patch_version": self.player_patches.version,
+            "frame_seq": self.frames.seq,
+            "frames_forgotten": self.frames.forgotten,
+            "frames": list(self.frames.entries),
+            "words": {"deck": self.words.deck.name,
+                      "category": self.words.category,
+                      "remaining": self.words.remaining,
+                      "swaps": list(self.words.swaps.items())},
+        }
+        
+    @classmethod
+    def from_snapshot(cls, snapshot: Dict) -> "GameRoom":
+        words = snapshot["words"]
+        try:
+            cursor = word_bank.cursor(words["deck"], words["category"])
+            cursor.remaining = words["remaining"]
+            cursor.swaps = dict(words["swaps"])
+        except KeyError:
+            cursor = None
+            
+        room = cls(snapshot["room_id"], number_of_rounds=snapshot["number_of_rounds"], words=cursor)
+        room.is_started = snapshot["is_started"]
+        room.is_voting = snapshot["is_voting"]
+        room.impostor = snapshot["impostor"]
+        room.the_word = snapshot["the_word"]
+        room.order = snapshot["order"]
+        room.votes = snapshot["votes"]
+        room.player_patches.version = snapshot["patch_version"]
+        
+        for fields in snapshot["players"]:
+            player = Player(**fields)
+            room.players[player.player_id] = player
+            room.count_player(player, 1)
+            
+        for player_id, token in snapshot["resume_tokens"].items():
+            room.resume_tokens[token] = player_id
+            room.tokens_by_player[player_id] = token
+            
+        for seq, (event, data), to, skip in snapshot["frames"]:
+            # The plain event string encodes the same as the Event member
+            message = BroadcastMessage(event, data)
+            message.seq = seq
+            room.frames.entries.append((seq, message, to, skip))
+            
+        room.frames.seq = snapshot["frame_seq"]
+        room.frames.forgotten = snapshot["frames_forgotten"]
+        
+        return room
         
     def delete_player(self, player_id: str):
         if player_id in self.players:
-            del self.players[player_id]
+            self.count_player(self.players.pop(player_id), -1)
+            
+    def count_player(self, player: Player, sign: int):
+        for name in COUNTED_FIELDS:
+            if getattr(player, name):
+                self.counts[name] += sign
+            
+    def record_changes(self, player_id: str, changed: Dict):
+        if changed:
+            self.player_patches.changed(player_id, changed)
+            
+            # `changed` only holds fields whose value actually flipped
+            for name in COUNTED_FIELDS:
+                if name in changed:
+                    self.counts[name] += 1 if changed[name] else -1
+            
+    def update_player(self, player_id: str, **fields):
+        self.record_changes(player_id, self.players[player_id].update(**fields))
             
     def set_ready(self, player_id: str):
-        self.players[player_id].is_ready = True
+        self.record_changes(player_id, self.players[player_id].set_ready(True))
         
     def set_name(self, player_id: str, new_name):
-        self.players[player_id].player_name = new_name
+        self.record_changes(player_id, self.players[player_id].set_name(new_name))
     
     def set_image(self, player_id: str, new_image):
-        self.players[player_id].player_image_url = new_image
+        self.record_changes(player_id, self.players[player_id].set_image(new_image))
     
     def unready(self, player_id: str):
-        self.players[player_id].is_ready = False
+        self.record_changes(player_id, self.players[player_id].set_ready(False))
+        
+    @property
+    def status(self) -> RoomStatus:
+        return RoomStatus.STARTED if self.is_started else RoomStatus.WAITING
         
     def start_game(self):
         self.is_started = True
+        room_registry.set_status(self.room_id, self.status)
+        self.publish_status()
         
         ids = [player.player_id for player in self.players.values()]
         
@@ -67,32 +388,41 @@ class GameRoom:
         
         self.order = ids * self.number_of_rounds
         
+    def publish_status(self):
+        status_board.update(self.room_id, self.status, len(self.players))
+        
     def start_turn(self, player_id: str):
-        self.players[player_id].currently_discussing = True
+        self.update_player(player_id, currently_discussing=True)
     
     def end_turn(self, player_id: str):
-        self.players[player_id].currently_discussing = False
-        self.players[player_id].turn_ended = True
+        self.update_player(player_id, currently_discussing=False, turn_ended=True)
         
     def next_round(self):
-        for player in self.players.values():
-            player.turn_ended = False
+        for player_id in self.players.keys():
+            self.update_player(player_id, turn_ended=False)
         
     def whos_next(self) -> Union[Player, None]:
         if len(self.order) == 0:
             return
         
-        all_done = all([player.turn_ended for player in self.players.values()])
-        
-        if all_done:
+        if self.all_turns_ended():
             self.next_round()
         
-        next_player = self.players[self.order.pop()]
-        
-        return next_player
+        # Skip turns of players who left mid-game
+        while self.order:
+            next_player = self.players.get(self.order.pop())
+            
+            if next_player:
+                return next_player
+            
+        return None
     
     def reset_room(self):
         self.is_started = False
+        self.is_voting = False
+        self.clear_deadline()
+        room_registry.set_status(self.room_id, self.status)
+        self.publish_status()
         self.votes = {}
         self.impostor = ""
         self.the_word = ""
@@ -100,39 +430,42 @@ class GameRoom:
         
         for player_id in self.players.keys():
             try:
-                self.players[player_id].is_ready = False
-                self.players[player_id].turn_ended = False
-                self.players[player_id].has_voted = False
-                self.players[player_id].currently_discussing = False
+                self.update_player(player_id,
+                                   is_ready=False,
+                                   turn_ended=False,
+                                   has_voted=False,
+                                   currently_discussing=False)
             except Exception as e:
-                logger.warning(f"Something went wrong when updating player: {e}")
+                logger.warning("Something went wrong when updating player: {}", e)
         
     def all_ready(self) -> bool:
-        return all([ player.is_ready for player in self.players.values() ])
+        return self.counts["is_ready"] == len(self.players)
     
     def all_voted(self) -> bool:
-        return all([ player.has_voted for player in self.players.values() ])
+        return self.counts["has_voted"] == len(self.players)
+    
+    def all_turns_ended(self) -> bool:
+        return self.counts["turn_ended"] == len(self.players)
     
-    def vote(self, voter: str, voted: str):
-        logger.info(f"{voter} voted for {voted}")
+    def vote(self, voter: str, voted: str) -> bool:
+        if self.players[voter].has_voted:
+            self.log.info("{} already voted; ignoring vote for {}", voter, voted)
+            return False
         
-        if self.votes.get(voted):
-            self.votes[voted].append(self.players[voter].player_image_url)
-        else:
-            self.votes[voted] = [self.players[voter].player_image_url]
+        self.log.info("{} voted for {} in room {}", voter, voted, self.room_id)
+        
+        # The voters' images per candidate double as the tally
+        self.votes.setdefault(voted, []).append(self.players[voter].player_image_url)
         
-        self.players[voter].has_voted = True
+        self.update_player(voter, has_voted=True)
+        return True
         
     async def generate_impostor(self):
         players = list(self.players.keys())
         self.impostor = random.choice(players)
         
     def winner(self):
-        vote_count = 0
-        
-        for vote in self.votes.items():
-            if vote == self.impostor:
-                vote_count += 1
+        vote_count = len(self.votes.get(self.impostor, ()))
         
         if vote_count <= 0:
             return "impostor"
@@ -144,56 +477,90 @@ class GameRoom:
         
     
     async def send_to_player(self, player: Player, broadcast_message: BroadcastMessage):
-        try:
-            await player.websocket.send_text(json.dumps(broadcast_message.to_dict()))
-            logger.info(f"Player list sent to: {player.player_id}")
-        except Exception as e:
-            logger.exception(f"Something went wrong when sending message to player! {e}")
+        self.frames.record(broadcast_message, to=player.player_id)
+        self.send_frame(player, broadcast_message)
+        
+    def send_frame(self, player: Player, broadcast_message: BroadcastMessage):
+        queue = self.outbound.get(player.player_id)
+        if not queue:
+            # Players holding a slot get what they missed from the frame log on resume
+            if player.player_id not in self.away:
+                self.log.warning("No outbound queue for player {}", player.player_id)
+            return
+        
+        # Each message is encoded at most once per wire format, however many players get it
+        queue.put(broadcast_message.encode(queue.wire_format), broadcast_message.coalesce_key)
+        self.log.debug("Sent {} to {}", broadcast_message.event, player.player_id)
+            
+    def fan_out(self, messages: List[Tuple[Player, BroadcastMessage]]):
+        start = perf_counter()
+        
+        for player, broadcast_message in messages:
+            self.send_frame(player, broadcast_message)
+            
+        FAN_OUT_SECONDS.observe(perf_counter() - start)
             
     async def send_to_all_players(self, broadcast_message: BroadcastMessage):
-        tasks = [
-            (player, self.send_to_player(player, broadcast_message))
-            for player in self.players.values()
-        ]
-
-        results = await asyncio.gather(
-            *(task for _, task in tasks),
-            return_exceptions=True
-        )
-
-        for (player, _), result in zip(tasks, results):
-            if isinstance(result, Exception):
-                logger.exception(f"Error sending message to player {player.player_id}: {result}")
+        self.frames.record(broadcast_message)
+        self.fan_out([(player, broadcast_message) for player in list(self.players.values())])
+        self.spectators.publish(broadcast_message)
                 
     async def send_to_all_except_impostor(self, 
                                           broadcast_message_to_all: BroadcastMessage,
                                           broadcast_message_to_impostor: BroadcastMessage):
-        tasks = [
-            (player, self.send_to_player(player, broadcast_message_to_all))
-            for player in self.players.values() if player != self.impostor
-        ]
-
-        results = await asyncio.gather(
-            *(task for _, task in tasks),
-            return_exceptions=True
-        )
-
-        for (player, _), result in zip(tasks, results):
-            if isinstance(result, Exception):
-                logger.exception(f"Error sending message to player {player.player_id}: {result}")
-                
-        await self.send_to_player(self.players[self.impostor], broadcast_message_to_impostor)
+        seq = self.frames.next_seq()
+        self.frames.record(broadcast_message_to_all, skip=self.impostor, seq=seq)
+        self.frames.record(broadcast_message_to_impostor, to=self.impostor, seq=seq)
+        
+        self.fan_out([
+            (player, broadcast_message_to_impostor if player.player_id == self.impostor else broadcast_message_to_all)
+            for player in list(self.players.values())
+        ])
+        # Spectators only ever see what the players who are not the impostor see
+        self.spectators.publish(broadcast_message_to_all)
     
     async def send_updated_player_list(self):
-        logger.info("sending updated player list")
-        player_dicts = [
-            player.model_dump(exclude={"websocket"})
-            for player in self.players.values()
-        ]
+        if self.flush_tick > 0:
+            if not self.pending_flush:
+                self.pending_flush = scheduler.call_later(self.flush_tick, lambda: self.post(self.flush_player_list))
+            return
         
-        message = BroadcastMessage(Event.UPDATED_PLAYERS_LIST, {"players": player_dicts})
+        await self.flush_player_list()
+        
+    async def flush_player_list(self):
+        if self.pending_flush:
+            self.pending_flush.cancel()
+            self.pending_flush = None
+            
+        patch = self.player_patches.drain()
+        if not patch:
+            return
+        
+        self.log.debug("Sending player patch {} in room {}", patch["seq"], self.room_id)
+        message = BroadcastMessage(Event.PLAYERS_PATCH, patch)
         
         await self.send_to_all_players(message)
+        
+    async def join(self, player: Player, websocket: WebSocket, wire_format: WireFormat = WireFormat.JSON) -> bool:
+        # Checked here rather than by the caller so two joins racing for the last seat can't both win
+        if room_is_full(len(self.players)):
+            return False
+        
+        self.add_player(player, websocket, wire_format)
+        self.log.info("Player {} joined room {}, now {} players", player.player_id, self.room_id, len(self.players))
+        
+        await self.send_player_snapshot(player)
+        await self.send_updated_player_list()
+        await self.notify_player_who_joined(player)
+        
+        return True
+        
+    async def send_player_snapshot(self, player: Player):
+        player_dicts = [other.to_dict() for other in self.players.values()]
+        
+        message = BroadcastMessage(Event.UPDATED_PLAYERS_LIST, {"players": player_dicts, "seq": self.player_patches.version})
+        
+        await self.send_to_player(player, message)
                 
     async def send_countdown_start(self):
         message = BroadcastMessage(Event.COUNTDOWN_START, {})
@@ -201,7 +568,10 @@ class GameRoom:
         await self.send_to_all_players(message)
     
     async def send_game_start(self):
-        random_word = generate_random_word()
+        # Latency-critical: goes out now, after any player changes it depends on
+        await self.flush_player_list()
+        
+        random_word = self.words.draw()
         message = BroadcastMessage(Event.GAME_START, GameWord(is_impostor=False, word=random_word.word).model_dump())
         message_to_impostor = BroadcastMessage(Event.GAME_START, GameWord(is_impostor=True, word=random_word.clue).model_dump())
         self.the_word = random_word.word
@@ -209,7 +579,7 @@ class GameRoom:
         await self.send_to_all_except_impostor(message, message_to_impostor)
         
     async def send_voting_start(self):
-        message = BroadcastMessage(Event.VOTING_START, {})
+        message = BroadcastMessage(Event.VOTING_START, {"deadline_seconds": VOTE_SECONDS})
         
         await self.send_to_all_players(message)
         
@@ -221,6 +591,8 @@ class GameRoom:
         await self.send_to_all_players(message)
         
     async def show_impostor(self):
+        await self.flush_player_list()
+        
         votes_list = []
         
         for player, voters in self.votes.items():
@@ -251,15 +623,35 @@ class GameRoom:
             await self.send_to_all_players(message)
             
     async def notify_player_who_joined(self, player: Player):
-        logger.info("notifying player who joined")
-        message = BroadcastMessage(Event.PLAYER_JOINED, {"current_player" : player.model_dump(exclude={"websocket"})})
+        self.log.debug("Notifying {} that they joined", player.player_id)
+        message = BroadcastMessage(Event.PLAYER_JOINED, {"current_player" : player.to_dict(),
+                                                         "resume_token" : self.tokens_by_player.get(player.player_id)})
         
         await self.send_to_player(player, message)
         
     async def notify_player_their_turn(self, player: Player):
-        message = BroadcastMessage(Event.START_TURN, {})
+        await self.flush_player_list()
+        
+        message = BroadcastMessage(Event.START_TURN, {"deadline_seconds": TURN_SECONDS})
         
         await self.send_to_player(player, message)
         
     
-rooms: Dict[str, GameRoom] = {}
\ No newline at end of file
+GameRoom.departure = GameRoom.leave
+
+rooms: Dict[str, GameRoom] = {}
+
+def delete_room(room_id: str):
+    room = rooms.pop(room_id, None)
+    room_registry.release(room_id)
+    status_board.remove(room_id)
+    
+    if room:
+        room.mailbox.close()
+
+Gauge("balatkayo_active_rooms", "Rooms held by this worker", lambda: len(rooms))
+Gauge("balatkayo_players", "Players across all rooms", lambda: sum(len(room.players) for room in rooms.values()))
+Gauge("balatkayo_outbound_queue_depth", "Frames waiting in outbound queues across all connections",
+      lambda: sum(queue.depth for room in rooms.values() for queue in room.outbound.values()))
+Gauge("balatkayo_room_mailbox_depth", "Jobs waiting in each room's mailbox",
+      lambda: {(room_id,): room.mailbox.depth() for room_id, room in rooms.items()}, ("room",))
\ No newline at end of file
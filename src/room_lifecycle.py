@@ -0,0 +1,68 @@
+from typing import List, Tuple
+from time import monotonic
+import asyncio
+import heapq
+from loguru import logger
+
+from .room import GameRoom, rooms, delete_room
+from .room_registry import room_registry
+from .metrics import Counter
+from .config import ROOM_SWEEP_INTERVAL_SECONDS
+
+ROOMS_CREATED = Counter("balatkayo_rooms_created_total", "Rooms created by this worker")
+ROOMS_EXPIRED = Counter("balatkayo_rooms_expired_total", "Rooms reaped after being abandoned")
+
+class RoomReaper:
+    """
+    Evicts abandoned rooms with one background task and a min-heap of expiry times.
+
+    Activity only moves `GameRoom.last_activity`; the heap entry is checked lazily. When
+    an entry comes due the room's real expiry is recomputed and the entry is pushed back
+    if the room saw activity since, so each sweep only touches rooms that are due and
+    every room has exactly one entry in the heap.
+    """
+    def __init__(self, interval: float = ROOM_SWEEP_INTERVAL_SECONDS):
+        self.interval = interval
+        self.expiries: List[Tuple[float, str]] = []
+
+    def open_room(self, room: GameRoom):
+        self.watch(room)
+        ROOMS_CREATED.inc()
+
+    def watch(self, room: GameRoom):
+        rooms[room.room_id] = room
+        room_registry.set_status(room.room_id, room.status)
+        room.publish_status()
+
+        heapq.heappush(self.expiries, (room.expires_at(), room.room_id))
+
+    async def sweep(self):
+        now = monotonic()
+
+        while self.expiries and self.expiries[0][0] <= now:
+            _, room_id = heapq.heappop(self.expiries)
+            room = rooms.get(room_id)
+
+            if room is None:
+                continue
+
+            expires_at = room.expires_at()
+            if expires_at > now:
+                heapq.heappush(self.expiries, (expires_at, room_id))
+                continue
+
+            logger.info("Reaping abandoned room {} with {} players", room_id, len(room.players))
+            delete_room(room_id)
+            ROOMS_EXPIRED.inc()
+            await room.close()
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+
+            try:
+                await self.sweep()
+            except Exception as e:
+                logger.exception("Room sweep failed: {}", e)
+
+room_reaper = RoomReaper()
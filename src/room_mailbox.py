@@ -0,0 +1,72 @@
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Tuple, Union
+import asyncio
+from time import perf_counter
+from loguru import logger
+
+from .metrics import Histogram
+
+ROOM_JOB_SECONDS = Histogram("balatkayo_room_job_seconds", "Time a room spent applying one job from its mailbox", ("room",))
+
+Job = Callable[..., Awaitable[Any]]
+
+class RoomMailbox:
+    """
+    Runs every state change of one room serially, in the order it was posted.
+
+    Connections, timers and the outbound queues post jobs instead of touching the room
+    themselves, and a single consumer task applies them one at a time, so a job never
+    sees another job's half-finished changes across an `await`. Rooms do not share a
+    consumer, so they still progress independently. The consumer only exists while
+    there is work queued.
+
+    A job must never `call` into its own room's mailbox; it would wait on itself.
+    """
+    def __init__(self, room_id: str):
+        self.room_id = room_id
+        self.jobs: Deque[Tuple[Job, tuple, Union[asyncio.Future, None]]] = deque()
+        self.consumer: Union[asyncio.Task, None] = None
+        # Jobs applied so far; lets checkpoints tell which rooms changed since the last one
+        self.applied = 0
+        self.processing = ROOM_JOB_SECONDS.labels(room_id)
+
+    def post(self, job: Job, *args, reply: Union[asyncio.Future, None] = None):
+        self.jobs.append((job, args, reply))
+
+        if self.consumer is None:
+            self.consumer = asyncio.get_running_loop().create_task(self.run())
+
+    async def call(self, job: Job, *args) -> Any:
+        # Waits until the job has been applied and hands back its result or exception
+        reply = asyncio.get_running_loop().create_future()
+        self.post(job, *args, reply=reply)
+
+        return await reply
+
+    def depth(self) -> int:
+        return len(self.jobs)
+
+    async def run(self):
+        try:
+            while self.jobs:
+                job, args, reply = self.jobs.popleft()
+                start = perf_counter()
+
+                try:
+                    result = await job(*args)
+                except Exception as e:
+                    if reply is None:
+                        logger.exception("Job {} failed in room {}: {}", job.__name__, self.room_id, e)
+                    elif not reply.done():
+                        reply.set_exception(e)
+                else:
+                    if reply is not None and not reply.done():
+                        reply.set_result(result)
+
+                self.applied += 1
+                self.processing.observe(perf_counter() - start)
+        finally:
+            self.consumer = None
+
+    def close(self):
+        ROOM_JOB_SECONDS.remove(self.room_id)
@@ -0,0 +1,189 @@
+from abc import ABC, abstractmethod
+from typing import Dict, Set, Tuple, Union
+from loguru import logger
+import asyncio
+import sqlite3
+
+from .config import ROOM_REGISTRY_BACKEND, ROOM_REGISTRY_PATH
+from .config import ROOM_REGISTRY_BUSY_TIMEOUT_SECONDS, ROOM_REGISTRY_FLUSH_SECONDS
+from .metrics import Counter
+
+REGISTRY_FLUSHES_DEFERRED = Counter("balatkayo_registry_flushes_deferred_total", "Registry flushes put off because another worker held the lock")
+
+class RegistryUnavailable(Exception):
+    """The shared registry stayed locked past its busy timeout; try again shortly."""
+
+class RoomRegistry(ABC):
+    """
+    Directory of every room across workers: which worker owns it and its last published status.
+
+    Live `GameRoom` objects stay in the owning worker's `rooms` dict; the registry only
+    holds what other workers need to answer for a room they do not own.
+    """
+    shared = False
+
+    @abstractmethod
+    def claim(self, room_id: str, worker: int) -> bool:
+        ...
+
+    @abstractmethod
+    def owner(self, room_id: str) -> Union[int, None]:
+        ...
+
+    @abstractmethod
+    def set_status(self, room_id: str, status: str):
+        ...
+
+    @abstractmethod
+    def status(self, room_id: str) -> Union[str, None]:
+        ...
+
+    @abstractmethod
+    def release(self, room_id: str):
+        ...
+
+    @abstractmethod
+    def forget_worker(self, worker: int):
+        ...
+
+    def flush(self):
+        pass
+
+    async def run(self):
+        pass
+
+class InProcessRoomRegistry(RoomRegistry):
+    def __init__(self):
+        self.entries: Dict[str, Tuple[int, Union[str, None]]] = {}
+
+    def claim(self, room_id: str, worker: int) -> bool:
+        if room_id in self.entries:
+            return False
+
+        self.entries[room_id] = (worker, None)
+        return True
+
+    def owner(self, room_id: str) -> Union[int, None]:
+        entry = self.entries.get(room_id)
+        return entry[0] if entry else None
+
+    def set_status(self, room_id: str, status: str):
+        entry = self.entries.get(room_id)
+        if entry:
+            self.entries[room_id] = (entry[0], status)
+
+    def status(self, room_id: str) -> Union[str, None]:
+        entry = self.entries.get(room_id)
+        return entry[1] if entry else None
+
+    def release(self, room_id: str):
+        self.entries.pop(room_id, None)
+
+    def forget_worker(self, worker: int):
+        self.entries = {room_id: entry for room_id, entry in self.entries.items() if entry[0] != worker}
+
+class SqliteRoomRegistry(RoomRegistry):
+    """
+    Registry shared by the workers on one box through a SQLite file in WAL mode.
+
+    A claim is written straight away since allocating a room ID needs its answer. Status
+    changes and releases only queue up, and `run` writes them in one transaction every
+    `flush_interval`, so other workers see them up to that much later. Once `run` has
+    started, a write waits at most `busy_timeout` for another worker's lock rather than
+    stalling the event loop: a claim raises RegistryUnavailable, a flush keeps its queue
+    for the next tick.
+    """
+    shared = True
+
+    def __init__(self, path: str, busy_timeout: float = ROOM_REGISTRY_BUSY_TIMEOUT_SECONDS,
+                 flush_interval: float = ROOM_REGISTRY_FLUSH_SECONDS):
+        # Startup (forgetting old rooms, restoring snapshots) may wait out a neighbour's write
+        self.connection = sqlite3.connect(path, timeout=5, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute("CREATE TABLE IF NOT EXISTS rooms ("
+                                "room_id TEXT PRIMARY KEY, "
+                                "worker INTEGER NOT NULL, "
+                                "status TEXT)")
+        self.busy_timeout = busy_timeout
+        self.flush_interval = flush_interval
+        self.statuses: Dict[str, str] = {}
+        self.released: Set[str] = set()
+
+    def claim(self, room_id: str, worker: int) -> bool:
+        try:
+            cursor = self.connection.execute("INSERT OR IGNORE INTO rooms (room_id, worker) VALUES (?, ?)", (room_id, worker))
+        except sqlite3.OperationalError as e:
+            raise RegistryUnavailable(str(e)) from e
+
+        return cursor.rowcount == 1
+
+    def owner(self, room_id: str) -> Union[int, None]:
+        row = self.connection.execute("SELECT worker FROM rooms WHERE room_id = ?", (room_id,)).fetchone()
+        return row[0] if row else None
+
+    def set_status(self, room_id: str, status: str):
+        self.statuses[room_id] = status
+
+    def status(self, room_id: str) -> Union[str, None]:
+        # This worker's own changes count before they are flushed
+        if room_id in self.released:
+            return None
+
+        if room_id in self.statuses:
+            return self.statuses[room_id]
+
+        row = self.connection.execute("SELECT status FROM rooms WHERE room_id = ?", (room_id,)).fetchone()
+        return row[0] if row else None
+
+    def release(self, room_id: str):
+        self.statuses.pop(room_id, None)
+        self.released.add(room_id)
+
+    def forget_worker(self, worker: int):
+        self.connection.execute("DELETE FROM rooms WHERE worker = ?", (worker,))
+
+    def flush(self):
+        if not self.statuses and not self.released:
+            return
+
+        statuses, released = self.statuses, self.released
+        self.statuses, self.released = {}, set()
+
+        try:
+            self.connection.execute("BEGIN IMMEDIATE")
+            self.connection.executemany("DELETE FROM rooms WHERE room_id = ?", [(room_id,) for room_id in released])
+            self.connection.executemany("UPDATE rooms SET status = ? WHERE room_id = ?",
+                                        [(status, room_id) for room_id, status in statuses.items()])
+            self.connection.execute("COMMIT")
+        except sqlite3.OperationalError as e:
+            if self.connection.in_transaction:
+                self.connection.execute("ROLLBACK")
+
+            # Put the batch back under anything queued since, which is newer
+            statuses = {room_id: status for room_id, status in statuses.items() if room_id not in self.released}
+            statuses.update(self.statuses)
+            self.statuses = statuses
+            self.released |= released
+
+            REGISTRY_FLUSHES_DEFERRED.inc()
+            logger.warning("Room registry busy, keeping {} changes for the next flush: {}", len(statuses) + len(self.released), e)
+
+    async def run(self):
+        # From here on every write happens on the event loop
+        self.connection.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout * 1000)}")
+
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            self.flush()
+
+def create_registry(backend: str = ROOM_REGISTRY_BACKEND) -> RoomRegistry:
+    if backend == "memory":
+        return InProcessRoomRegistry()
+
+    if backend == "sqlite":
+        return SqliteRoomRegistry(ROOM_REGISTRY_PATH)
+
+    raise ValueError(f"Unknown room registry backend: {backend}")
+
+room_registry = create_registry()
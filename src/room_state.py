@@ -0,0 +1,81 @@
+from collections import deque
+from typing import Any, Deque, Dict, List, Tuple, Union
+
+class PlayerPatchLog:
+    """
+    Player-list changes that have not been broadcast yet, merged per player.
+
+    Every drained patch bumps `version`, so clients can apply patches in order on top
+    of the snapshot they got on join and ask for a resync when they see a gap. Ops are
+    idempotent, which lets a snapshot include changes that are still pending.
+    """
+    def __init__(self):
+        self.version = 0
+        self.pending: Dict[str, Dict[str, Any]] = {}
+
+    def added(self, player_id: str, player: Dict[str, Any]):
+        # Copied, since later changes are merged into it
+        self.pending[player_id] = {"op": "add", "player": dict(player)}
+
+    def removed(self, player_id: str):
+        self.pending[player_id] = {"op": "remove", "player_id": player_id}
+
+    def changed(self, player_id: str, fields: Dict[str, Any]):
+        op = self.pending.get(player_id)
+
+        if op is None:
+            self.pending[player_id] = {"op": "update", "player_id": player_id, "fields": dict(fields)}
+        elif op["op"] == "add":
+            op["player"].update(fields)
+        elif op["op"] == "update":
+            op["fields"].update(fields)
+
+    def drain(self) -> Union[Dict[str, Any], None]:
+        if not self.pending:
+            return None
+
+        self.version += 1
+        ops = list(self.pending.values())
+        self.pending = {}
+
+        return {"seq": self.version, "ops": ops}
+
+class FrameLog:
+    """
+    The last `size` messages a room sent, numbered with one sequence per room.
+
+    Each entry remembers who the message went to: everyone, only `to`, or everyone but
+    `skip`. A message split by recipient (the impostor gets a different game start) is
+    recorded once per variant under the same number, since every player receives
+    exactly one of them. A resuming player gets back the entries addressed to them with
+    a number above the last one they saw.
+    """
+    def __init__(self, size: int):
+        self.seq = 0
+        self.entries: Deque[Tuple[int, Any, Union[str, None], Union[str, None]]] = deque(maxlen=size)
+        # Highest sequence number that has fallen out of the buffer
+        self.forgotten = 0
+
+    def next_seq(self) -> int:
+        self.seq += 1
+        return self.seq
+
+    def record(self, message, to: Union[str, None] = None, skip: Union[str, None] = None, seq: Union[int, None] = None):
+        if not message.sequenced:
+            return
+
+        if message.seq is None:
+            message.seq = seq or self.next_seq()
+
+        if len(self.entries) == self.entries.maxlen:
+            self.forgotten = self.entries[0][0]
+
+        self.entries.append((message.seq, message, to, skip))
+
+    def since(self, last_seq: int, player_id: str) -> Union[List[Any], None]:
+        # None when some of what the player missed is no longer buffered
+        if last_seq < self.forgotten or last_seq > self.seq:
+            return None
+
+        return [message for seq, message, to, skip in self.entries
+                if seq > last_seq and (to is None or to == player_id) and skip != player_id]
@@ -0,0 +1,82 @@
+from typing import Dict, Iterable, Union
+import asyncio
+import itertools
+import json
+
+from .game_types import RoomStatus
+from .metrics import Gauge
+from .config import MAX_PLAYERS_PER_ROOM
+
+class RoomSummary:
+    """What status requests see of a room, encoded once per change instead of per request."""
+    __slots__ = ("data", "body", "etag")
+
+    def __init__(self, status: RoomStatus, players: int, version: int):
+        self.data = {"status": status,
+                     "players": players,
+                     "capacity": MAX_PLAYERS_PER_ROOM or None,
+                     "version": version}
+        self.body = json.dumps(self.data, separators=(",", ":")).encode()
+        self.etag = f'"{version}"'
+
+# Unknown and deleted rooms; version 0 never belongs to a live room
+INVALID_SUMMARY = RoomSummary(RoomStatus.INVALID, 0, 0)
+
+class StatusBoard:
+    """
+    Cached summaries of this worker's rooms, for status requests and the clients watching them.
+
+    Rooms push a new summary on the transitions that change it (opened, a player joined
+    or left, game started or reset, deleted), and every summary takes the next version
+    of a worker-wide counter, which doubles as its ETag. A request only looks one up.
+    Watchers of a room share one event that the next change sets, and it only exists
+    while someone is waiting.
+    """
+    def __init__(self):
+        self.summaries: Dict[str, RoomSummary] = {}
+        self.waiters: Dict[str, asyncio.Event] = {}
+        self.versions = itertools.count(1)
+
+    def update(self, room_id: str, status: RoomStatus, players: int):
+        current = self.summaries.get(room_id)
+        if current and current.data["status"] == status and current.data["players"] == players:
+            return
+
+        self.summaries[room_id] = RoomSummary(status, players, next(self.versions))
+        self.wake(room_id)
+
+    def remove(self, room_id: str):
+        if self.summaries.pop(room_id, None):
+            self.wake(room_id)
+
+    def wake(self, room_id: str):
+        waiter = self.waiters.pop(room_id, None)
+        if waiter:
+            waiter.set()
+
+    def get(self, room_id: str) -> RoomSummary:
+        return self.summaries.get(room_id, INVALID_SUMMARY)
+
+    def many(self, room_ids: Iterable[str]) -> Dict[str, Union[RoomSummary, None]]:
+        return {room_id: self.summaries.get(room_id) for room_id in room_ids}
+
+    async def wait(self, room_id: str, etag: Union[str, None], timeout: float) -> RoomSummary:
+        # Returns as soon as the summary no longer matches `etag`, or when the timeout runs out
+        summary = self.get(room_id)
+        if etag != summary.etag or summary is INVALID_SUMMARY:
+            return summary
+
+        waiter = self.waiters.get(room_id)
+        if waiter is None:
+            waiter = self.waiters[room_id] = asyncio.Event()
+
+        try:
+            await asyncio.wait_for(waiter.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+        return self.get(room_id)
+
+status_board = StatusBoard()
+
+Gauge("balatkayo_status_watchers", "Rooms with clients waiting on a status change", lambda: len(status_board.waiters))
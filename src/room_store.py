@@ -0,0 +1,145 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
+import asyncio
+import gc
+import json
+import sqlite3
+from time import perf_counter
+from loguru import logger
+
+from .room import GameRoom, rooms
+from .room_registry import room_registry
+from .room_lifecycle import room_reaper
+from .event_controller import restart_deadlines
+from .metrics import Counter, Histogram
+from .config import ROOM_SNAPSHOT_PATH, ROOM_SNAPSHOT_INTERVAL_SECONDS, WORKER_INDEX
+
+CHECKPOINT_SECONDS = Histogram("balatkayo_checkpoint_seconds", "Time spent writing one batch of room snapshots")
+ROOMS_CHECKPOINTED = Counter("balatkayo_rooms_checkpointed_total", "Room snapshots written")
+ROOMS_RESTORED = Counter("balatkayo_rooms_restored_total", "Rooms restored from snapshots on startup")
+
+# Rooms snapshotted before yielding back to the event loop
+COLLECT_BATCH = 256
+
+def encode_message(message) -> list:
+    return [message.event, message.data]
+
+class RoomStore:
+    """
+    Checkpoints rooms to SQLite so a restarted worker can pick its games back up.
+
+    Each checkpoint only snapshots rooms whose mailbox applied a job since their last one
+    and that are idle right now, so no snapshot catches a job halfway. Building a snapshot
+    copies a few lists on the event loop, in batches so a checkpoint of every room never
+    stalls it for long; encoding and the write happen in one transaction on a dedicated
+    thread. Rooms that were deleted in between are dropped in the same transaction.
+    """
+    def __init__(self, path: str = ROOM_SNAPSHOT_PATH, worker: int = WORKER_INDEX):
+        self.path = path
+        self.worker = worker
+        self.saved: Dict[str, int] = {}
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="room-store")
+        self.connection = sqlite3.connect(path, timeout=5, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute("CREATE TABLE IF NOT EXISTS room_snapshots ("
+                                "room_id TEXT PRIMARY KEY, "
+                                "worker INTEGER NOT NULL, "
+                                "snapshot TEXT NOT NULL)")
+
+    async def collect(self) -> Tuple[List[Tuple[str, int, Dict]], List[str]]:
+        changed = []
+        for index, (room_id, room) in enumerate(list(rooms.items())):
+            if index and index % COLLECT_BATCH == 0:
+                await asyncio.sleep(0)
+
+            applied = room.mailbox.applied
+
+            if self.saved.get(room_id) == applied or room.mailbox.consumer is not None:
+                continue
+
+            changed.append((room_id, applied, room.snapshot()))
+
+        deleted = [room_id for room_id in self.saved if room_id not in rooms]
+        return changed, deleted
+
+    def write(self, changed: List[Tuple[str, int, Dict]], deleted: List[str]):
+        start = perf_counter()
+        rows = [(room_id, self.worker, json.dumps(snapshot, separators=(",", ":"), default=encode_message))
+                for room_id, _, snapshot in changed]
+
+        with self.connection:
+            self.connection.executemany("INSERT OR REPLACE INTO room_snapshots (room_id, worker, snapshot) VALUES (?, ?, ?)", rows)
+            self.connection.executemany("DELETE FROM room_snapshots WHERE room_id = ?", [(room_id,) for room_id in deleted])
+
+        CHECKPOINT_SECONDS.observe(perf_counter() - start)
+
+    async def checkpoint(self):
+        changed, deleted = await self.collect()
+        if not changed and not deleted:
+            return
+
+        await asyncio.get_running_loop().run_in_executor(self.executor, self.write, changed, deleted)
+
+        for room_id, applied, _ in changed:
+            self.saved[room_id] = applied
+        for room_id in deleted:
+            self.saved.pop(room_id, None)
+
+        ROOMS_CHECKPOINTED.inc(len(changed))
+
+    def load(self) -> List[GameRoom]:
+        rows = self.connection.execute("SELECT snapshot FROM room_snapshots WHERE worker = ?", (self.worker,)).fetchall()
+        restored = []
+
+        for (snapshot,) in rows:
+            try:
+                restored.append(GameRoom.from_snapshot(json.loads(snapshot)))
+            except Exception as e:
+                logger.warning("Skipping unreadable room snapshot: {!r}", e)
+
+        return restored
+
+    def restore(self) -> int:
+        # Nothing built here is garbage yet; collections during the bulk load would only rescan it
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            return self.restore_rooms()
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+
+    def restore_rooms(self) -> int:
+        # Runs at startup, after this worker's registry claims were forgotten
+        restored = 0
+        for room in self.load():
+            if not room_registry.claim(room.room_id, self.worker):
+                logger.warning("Room {} was claimed again before it could be restored", room.room_id)
+                continue
+
+            room_reaper.watch(room)
+            # Nobody is connected yet; players get the usual window to resume
+            for player_id in room.players:
+                room.hold_slot(player_id)
+            restart_deadlines(room)
+
+            self.saved[room.room_id] = room.mailbox.applied
+            restored += 1
+
+        ROOMS_RESTORED.inc(restored)
+        logger.info("Restored {} rooms from {}", restored, self.path)
+        return restored
+
+    async def run(self, interval: float = ROOM_SNAPSHOT_INTERVAL_SECONDS):
+        while True:
+            await asyncio.sleep(interval)
+
+            try:
+                await self.checkpoint()
+            except Exception as e:
+                logger.exception("Room checkpoint failed: {}", e)
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+        self.connection.close()
@@ -0,0 +1,90 @@
+from typing import Any, Callable, Coroutine, List, Set, Tuple
+import asyncio
+import heapq
+import itertools
+from loguru import logger
+
+# The event loop only keeps weak references to tasks; these hold fire-and-forget ones until they finish
+background_tasks: Set[asyncio.Task] = set()
+
+def run_in_background(coro: Coroutine) -> asyncio.Task:
+    task = asyncio.get_running_loop().create_task(coro)
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+    return task
+
+class TimerHandle:
+    __slots__ = ("when", "callback", "cancelled")
+
+    def __init__(self, when: float, callback: Callable[[], Any]):
+        self.when = when
+        self.callback = callback
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+class Scheduler:
+    """
+    Deadlines for every room, driven by a single task sleeping until the earliest one.
+
+    Scheduling is a heap push and cancelling only flags the handle, so the cost per
+    timer stays O(log n) no matter how many rooms are waiting. Callbacks run on the
+    scheduler task; a callback returning a coroutine gets its own task so one room's
+    work never holds up another room's deadline.
+    """
+    def __init__(self):
+        self.timers: List[Tuple[float, int, TimerHandle]] = []
+        self.sequence = itertools.count()
+        self.wakeup = asyncio.Event()
+        self.task: asyncio.Task = None
+
+    def call_later(self, delay: float, callback: Callable[[], Any]) -> TimerHandle:
+        loop = asyncio.get_running_loop()
+        handle = TimerHandle(loop.time() + delay, callback)
+
+        heapq.heappush(self.timers, (handle.when, next(self.sequence), handle))
+
+        if self.timers[0][2] is handle:
+            self.wakeup.set()
+
+        if self.task is None or self.task.done() or self.task.get_loop() is not loop:
+            # Started lazily, and again if a new event loop took over (tests, benchmarks)
+            self.wakeup = asyncio.Event()
+            self.task = loop.create_task(self.run())
+
+        return handle
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+
+        while True:
+            self.wakeup.clear()
+
+            if not self.timers:
+                await self.wakeup.wait()
+                continue
+
+            delay = self.timers[0][0] - loop.time()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self.wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            _, _, handle = heapq.heappop(self.timers)
+            if handle.cancelled:
+                continue
+
+            try:
+                result = handle.callback()
+                if asyncio.iscoroutine(result):
+                    run_in_background(result)
+            except Exception as e:
+                logger.exception("Timer callback failed: {}", e)
+
+    def pending(self) -> int:
+        return len(self.timers)
+
+scheduler = Scheduler()
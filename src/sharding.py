@@ -0,0 +1,64 @@
+from typing import Union
+import secrets
+
+from .config import WORKER_COUNT, WORKER_INDEX, WORKER_BASE_PORT, WORKER_URL_TEMPLATE
+from .room_registry import room_registry
+
+# The first character of a room ID is the index of the worker that owns it
+ROOM_ID_ALPHABET = "0123456789abcdefghijklmnopqrstuvwxyz"
+ROOM_ID_LENGTH = 6
+
+if not 0 < WORKER_COUNT <= len(ROOM_ID_ALPHABET):
+    raise ValueError(f"WORKER_COUNT must be between 1 and {len(ROOM_ID_ALPHABET)}")
+
+def owner_of(room_id: str) -> Union[int, None]:
+    if len(room_id) != ROOM_ID_LENGTH:
+        return None
+
+    worker = ROOM_ID_ALPHABET.find(room_id[0])
+
+    if worker < 0 or worker >= WORKER_COUNT:
+        return None
+
+    return worker
+
+def is_local(room_id: str) -> bool:
+    return owner_of(room_id) == WORKER_INDEX
+
+def worker_url(worker: int) -> str:
+    return WORKER_URL_TEMPLATE.format(port=WORKER_BASE_PORT + worker, index=worker)
+
+class RoomIdAllocator:
+    """
+    Hands out this worker's room IDs, none of which can be guessed from the ones before it.
+
+    Knowing a room's ID is all it takes to join it, so every suffix is a fresh draw from
+    `secrets` over all 36^5 values, and the registry claim rejects one that is still
+    held. While the space is sparse a draw almost never collides, so allocation stays
+    O(1) expected however many rooms came before.
+    """
+    SPACE = len(ROOM_ID_ALPHABET) ** (ROOM_ID_LENGTH - 1)
+
+    def __init__(self, worker: int):
+        self.prefix = ROOM_ID_ALPHABET[worker]
+        self.worker = worker
+
+    def encode(self, value: int) -> str:
+        digits = []
+        for _ in range(ROOM_ID_LENGTH - 1):
+            value, digit = divmod(value, len(ROOM_ID_ALPHABET))
+            digits.append(ROOM_ID_ALPHABET[digit])
+
+        return self.prefix + "".join(digits)
+
+    def allocate(self) -> str:
+        while True:
+            room_id = self.encode(secrets.randbelow(self.SPACE))
+
+            if room_registry.claim(room_id, self.worker):
+                return room_id
+
+room_ids = RoomIdAllocator(WORKER_INDEX)
+
+def new_room_id() -> str:
+    return room_ids.allocate()
@@ -0,0 +1,87 @@
+from typing import Callable, Dict, List, Union
+import asyncio
+from fastapi import WebSocket
+
+from .broadcast_message import BroadcastMessage
+from .events import Event
+from .outbound_queue import OutboundQueue
+from .scheduler import TimerHandle, scheduler
+from .wire_format import WireFormat
+from .config import SPECTATOR_FLUSH_SECONDS, OUTBOUND_QUEUE_HIGH_WATER, OUTBOUND_QUEUE_LIMIT
+
+# Spectator queues filled before yielding back to the event loop
+SPECTATOR_BATCH = 128
+
+class SpectatorFeed:
+    """
+    Read-only audience of one room, kept apart from its players.
+
+    The room publishes its broadcasts here after they were queued for every player, and
+    the feed forwards them once per tick from a task of its own, a batch of spectators at
+    a time, so however large the audience, players never wait on it. Frames are the
+    room's own, encoded once per wire format for players and spectators alike. Player
+    patches are not forwarded one by one: a tick that saw any sends a single full player
+    list built from `snapshot`, which also coalesces in the queue of a spectator who
+    fell behind. Messages meant for a single player are never published, so neither is
+    the impostor's game start.
+    """
+    def __init__(self, snapshot: Callable[[], BroadcastMessage], tick: float = SPECTATOR_FLUSH_SECONDS):
+        self.snapshot = snapshot
+        self.tick = tick
+        self.queues: Dict[WebSocket, OutboundQueue] = {}
+        self.pending: List[BroadcastMessage] = []
+        self.players_changed = False
+        self.pending_flush: Union[TimerHandle, None] = None
+
+    def __len__(self) -> int:
+        return len(self.queues)
+
+    def add(self, websocket: WebSocket, wire_format: WireFormat, on_evict: Callable[[WebSocket], None]) -> OutboundQueue:
+        # Only the latest player list matters to a spectator, so its queue is kept short
+        queue = OutboundQueue(websocket, on_evict, wire_format, high_water=OUTBOUND_QUEUE_HIGH_WATER // 2, limit=OUTBOUND_QUEUE_LIMIT // 2)
+        self.queues[websocket] = queue
+
+        return queue
+
+    def remove(self, websocket: WebSocket) -> bool:
+        queue = self.queues.pop(websocket, None)
+        if queue:
+            queue.close()
+
+        return queue is not None
+
+    def publish(self, message: BroadcastMessage):
+        if not self.queues:
+            return
+
+        if message.event == Event.PLAYERS_PATCH:
+            self.players_changed = True
+        else:
+            self.pending.append(message)
+
+        if not self.pending_flush:
+            self.pending_flush = scheduler.call_later(self.tick, self.flush)
+
+    async def flush(self):
+        self.pending_flush = None
+        messages, self.pending = self.pending, []
+
+        if self.players_changed:
+            # Built now, so it already reflects everything that happened during the tick
+            messages.append(self.snapshot())
+            self.players_changed = False
+
+        for index, queue in enumerate(list(self.queues.values())):
+            if index and index % SPECTATOR_BATCH == 0:
+                await asyncio.sleep(0)
+
+            for message in messages:
+                queue.put(message.encode(queue.wire_format), message.coalesce_key)
+
+    def close(self):
+        if self.pending_flush:
+            self.pending_flush.cancel()
+            self.pending_flush = None
+
+        for queue in self.queues.values():
+            queue.close()
@@ -0,0 +1,156 @@
+"""
+Compiled static assets: word decks and name parts as memory-mapped string tables.
+
+Layout of a compiled file (native byte order, built on the host that serves it):
+
+    header   magic "BKA1", string count, int count      (3 x uint32)
+    offsets  string count + 1 byte offsets into the blob  (uint32)
+    ints     free-form uint32 section, e.g. an index      (uint32)
+    blob     every string, UTF-8 encoded, back to back
+
+Strings are only decoded when they are read, and the mapped pages are shared by every
+worker process on the box. Build everything ahead of time with
+
+    python -m src.static_assets
+
+otherwise a missing or stale asset is compiled the first time it is opened.
+"""
+from array import array
+from pathlib import Path
+from typing import Callable, Dict, List, Sequence, Tuple
+import json
+import mmap
+import os
+import struct
+
+from .config import STATIC_DIR
+
+COMPILED_DIR = STATIC_DIR / "compiled"
+MAGIC = b"BKA1"
+HEADER = struct.Struct("=4sII")
+
+DECK_FILES = {
+    "classic": "word_list.json",
+    "extended": "words_and_clues.json",
+    "set_two": "words_and_clues_two.json",
+    "set_three": "words_and_clues_three.json",
+    "set_four": "words_and_clues_four.json",
+}
+NAME_FILES = ("adjectives.txt", "nouns.txt")
+
+def write_asset(path: Path, strings: Sequence[str], ints: Sequence[int] = ()):
+    encoded = [string.encode("utf-8") for string in strings]
+
+    offsets = array("I", [0])
+    for blob in encoded:
+        offsets.append(offsets[-1] + len(blob))
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_suffix(f".{os.getpid()}.tmp")
+
+    with open(temporary, "wb") as file:
+        file.write(HEADER.pack(MAGIC, len(encoded), len(ints)))
+        file.write(offsets.tobytes())
+        file.write(array("I", ints).tobytes())
+        file.write(b"".join(encoded))
+
+    # Atomic, so workers compiling the same asset at once never see a partial file
+    os.replace(temporary, path)
+
+class Asset:
+    def __init__(self, path: Path):
+        with open(path, "rb") as file:
+            self.map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, self.count, int_count = HEADER.unpack_from(self.map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a compiled asset")
+
+        view = memoryview(self.map)
+        ints_at = HEADER.size + 4 * (self.count + 1)
+        self.blob_at = ints_at + 4 * int_count
+
+        self.offsets = view[HEADER.size:ints_at].cast("I")
+        self.ints = view[ints_at:self.blob_at].cast("I")
+
+    def string(self, index: int) -> str:
+        start = self.blob_at + self.offsets[index]
+        end = self.blob_at + self.offsets[index + 1]
+
+        return str(self.map[start:end], "utf-8")
+
+def load_deck_entries(name: str) -> List[Tuple[str, str]]:
+    with open(STATIC_DIR / DECK_FILES[name], "r") as file:
+        entries = json.load(file)["words"]
+
+    seen = set()
+    pairs = []
+    for entry in entries:
+        if entry["word"] not in seen:
+            seen.add(entry["word"])
+            pairs.append((entry["word"], entry["clue"]))
+
+    return pairs
+
+def compile_deck(name: str, path: Path):
+    """
+    Strings: every word, then every clue, then the sorted category names.
+    Ints: word count, category count, category start offsets (count + 1), then the word
+    indices of each category back to back.
+    """
+    pairs = load_deck_entries(name)
+
+    categories: Dict[str, List[int]] = {}
+    for index, (_, clue) in enumerate(pairs):
+        categories.setdefault(clue, []).append(index)
+
+    names = sorted(categories)
+    starts = [0]
+    flat: List[int] = []
+    for category in names:
+        flat.extend(categories[category])
+        starts.append(len(flat))
+
+    strings = [word for word, _ in pairs] + [clue for _, clue in pairs] + names
+    write_asset(path, strings, [len(pairs), len(names)] + starts + flat)
+
+def compile_names(path: Path):
+    """Strings: adjectives then nouns. Ints: the number of adjectives."""
+    parts = []
+    for name in NAME_FILES:
+        with open(STATIC_DIR / name, "r") as file:
+            parts.append([word.strip() for word in file.readlines()])
+
+    write_asset(path, parts[0] + parts[1], [len(parts[0])])
+
+def open_asset(path: Path, sources: Sequence[Path], build: Callable[[Path], None]) -> Asset:
+    if not path.exists() or path.stat().st_mtime < max(source.stat().st_mtime for source in sources):
+        build(path)
+
+    return Asset(path)
+
+def deck_asset(name: str) -> Asset:
+    if name not in DECK_FILES:
+        raise KeyError(f"Unknown deck: {name}")
+
+    return open_asset(COMPILED_DIR / f"deck_{name}.bin",
+                      [STATIC_DIR / DECK_FILES[name]],
+                      lambda path: compile_deck(name, path))
+
+def names_asset() -> Asset:
+    return open_asset(COMPILED_DIR / "names.bin",
+                      [STATIC_DIR / name for name in NAME_FILES],
+                      compile_names)
+
+def main():
+    for name in DECK_FILES:
+        path = COMPILED_DIR / f"deck_{name}.bin"
+        compile_deck(name, path)
+        print(f"{path.relative_to(STATIC_DIR)}: {path.stat().st_size} bytes")
+
+    path = COMPILED_DIR / "names.bin"
+    compile_names(path)
+    print(f"{path.relative_to(STATIC_DIR)}: {path.stat().st_size} bytes")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Wire formats a client can pick in its identify handshake.
+
+JSON frames are `{"event": name, "data": {...}}` text. Binary frames are a MessagePack
+array `[event code, data]`, where the code is the position of the event in `Event`,
+so new events must only ever be appended to the enum. Frames a room sends also carry
+its sequence number, as `"seq"` or a third array element.
+"""
+from enum import StrEnum
+from typing import Any, Dict, List, Union
+import json
+import msgpack
+
+from .events import Event
+
+class WireFormat(StrEnum):
+    JSON = "json"
+    MSGPACK = "msgpack"
+
+EVENT_CODES: Dict[str, int] = {event: code for code, event in enumerate(Event)}
+CODE_EVENTS: List[Event] = list(Event)
+
+def encode_frame(event: str, data: Any, wire_format: WireFormat, seq: Union[int, None] = None) -> Union[str, bytes]:
+    if wire_format == WireFormat.MSGPACK:
+        return msgpack.packb([EVENT_CODES[event], data] if seq is None else [EVENT_CODES[event], data, seq])
+
+    envelope = {"event": event, "data": data}
+    if seq is not None:
+        envelope["seq"] = seq
+
+    return json.dumps(envelope, separators=(",", ":"))
+
+def decode_binary_frame(frame: bytes) -> Dict[str, Any]:
+    # Rejects truncated frames, trailing bytes and non-string map keys with a ValueError
+    message = msgpack.unpackb(frame)
+
+    if not isinstance(message, list) or len(message) not in (2, 3) or not isinstance(message[0], int):
+        raise ValueError("Binary frames must be [event code, data] or [event code, data, seq]")
+
+    if not 0 <= message[0] < len(CODE_EVENTS):
+        raise ValueError(f"Unknown event code {message[0]}")
+
+    decoded = {"event": CODE_EVENTS[message[0]], "data": message[1]}
+    if len(message) == 3:
+        decoded["seq"] = message[2]
+
+    return decoded
@@ -1,11 +1,110 @@
 import random
-import json
+from typing import Dict, List, Sequence, Union
 
-from .config import STATIC_DIR
 from .game_types import WordClue
+from .static_assets import Asset, DECK_FILES, deck_asset
 
-with open('./static/word_list.json', 'r') as file:
-    word_list = [ WordClue(word=word_clue["word"], clue=word_clue["clue"]) for word_clue in json.load(file)["words"] ]
-    
-def generate_random_word() -> WordClue:
-    return random.choice(word_list)
\ No newline at end of file
+DEFAULT_DECK = "classic"
+
+class DeckWords:
+    """Read-only view of a deck's word/clue pairs, decoded from the mapped asset on access."""
+    def __init__(self, asset: Asset, size: int):
+        self.asset = asset
+        self.size = size
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, index: int) -> WordClue:
+        if not 0 <= index < self.size:
+            raise IndexError(index)
+
+        return WordClue(word=self.asset.string(index), clue=self.asset.string(self.size + index))
+
+class WordDeck:
+    """One source file, deduplicated by word and indexed by category (the clue)."""
+    def __init__(self, name: str, asset: Asset):
+        size, category_count = asset.ints[0], asset.ints[1]
+        starts = asset.ints[2:3 + category_count]
+        indices = asset.ints[3 + category_count:]
+
+        self.name = name
+        self.words = DeckWords(asset, size)
+        self.all: Sequence[int] = range(size)
+        self.category_names = [asset.string(2 * size + category) for category in range(category_count)]
+
+        # Slices of the mapped index, so pools are shared rather than copied
+        self.categories: Dict[str, Sequence[int]] = {
+            category_name.lower(): indices[starts[category]:starts[category + 1]]
+            for category, category_name in enumerate(self.category_names)
+        }
+
+    @classmethod
+    def load(cls, name: str) -> "WordDeck":
+        return cls(name, deck_asset(name))
+
+    def pool(self, category: Union[str, None] = None) -> Sequence[int]:
+        if category is None:
+            return self.all
+
+        return self.categories[category.lower()]
+
+class WordCursor:
+    """
+    No-repeat draws over a shared pool of deck indices.
+
+    A lazy Fisher-Yates shuffle: only the positions that have been swapped are stored,
+    so each draw is O(1) and a room holds O(draws) state instead of a copy of the deck.
+    The pool is reshuffled once every word has been drawn.
+    """
+    def __init__(self, deck: WordDeck, pool: Sequence[int], category: Union[str, None] = None):
+        self.deck = deck
+        self.pool = pool
+        self.category = category
+        self.remaining = len(pool)
+        self.swaps: Dict[int, int] = {}
+
+    def draw(self) -> WordClue:
+        if self.remaining == 0:
+            self.remaining = len(self.pool)
+            self.swaps.clear()
+
+        last = self.remaining - 1
+        position = random.randrange(self.remaining)
+        picked = self.swaps.get(position, position)
+
+        self.swaps[position] = self.swaps.get(last, last)
+        self.swaps.pop(last, None)
+        self.remaining = last
+
+        return self.deck.words[self.pool[picked]]
+
+class WordBank:
+    def __init__(self):
+        self.decks: Dict[str, WordDeck] = {}
+
+    def deck(self, name: str) -> WordDeck:
+        deck = self.decks.get(name)
+
+        if deck is None:
+            if name not in DECK_FILES:
+                raise KeyError(f"Unknown deck: {name}")
+
+            deck = self.decks[name] = WordDeck.load(name)
+
+        return deck
+
+    def cursor(self, deck_name: str = DEFAULT_DECK, category: Union[str, None] = None) -> WordCursor:
+        deck = self.deck(deck_name)
+
+        try:
+            pool = deck.pool(category)
+        except KeyError:
+            raise KeyError(f"Unknown category for deck {deck_name}: {category}")
+
+        return WordCursor(deck, pool, category)
+
+    def catalog(self) -> Dict[str, List[str]]:
+        return {name: self.deck(name).category_names for name in DECK_FILES}
+
+word_bank = WordBank()
@@ -0,0 +1,92 @@
+"""
+Plays random sequences of joins, leaves, ready toggles, turns, votes, new rounds and resets
+against a room, and after every step compares `counts`, `all_ready`, `all_voted`,
+`all_turns_ended` and `winner` with a brute-force recount over the players.
+"""
+import asyncio
+import random
+from unittest import mock
+
+import pytest
+
+from src.room import GameRoom, COUNTED_FIELDS
+from src.player import Player
+
+SEEDS = 200
+STEPS = 300
+
+class NullSocket:
+    async def send_text(self, frame: str):
+        pass
+
+@pytest.fixture(autouse=True)
+def quiet_room():
+    with mock.patch("src.room.logger"), mock.patch("src.logs.logger"), mock.patch("src.room.room_registry"):
+        yield
+
+def brute_force(room: GameRoom):
+    players = list(room.players.values())
+    counts = {name: sum(1 for player in players if getattr(player, name)) for name in COUNTED_FIELDS}
+
+    impostor_votes = 0
+    for voted, voters in room.votes.items():
+        if voted == room.impostor:
+            impostor_votes += len(voters)
+
+    winner = "players" if 0 < impostor_votes and impostor_votes > len(players) // 2 else "impostor"
+    return counts, all(player.is_ready for player in players), all(player.has_voted for player in players), \
+        all(player.turn_ended for player in players), winner
+
+def incremental(room: GameRoom):
+    return dict(room.counts), room.all_ready(), room.all_voted(), room.all_turns_ended(), room.winner()
+
+def random_step(room: GameRoom, rng: random.Random, sockets: dict, joined: int) -> int:
+    ids = list(room.players)
+    action = rng.choice(["join", "join", "leave", "ready", "unready", "turn", "vote", "vote", "round", "reset"])
+
+    if action == "join" or not ids:
+        player_id = f"player-{joined}"
+        sockets[player_id] = NullSocket()
+        room.add_player(Player(player_id=player_id, player_name=player_id, player_image_url=f"{player_id}.png"), sockets[player_id])
+        if not room.impostor:
+            room.impostor = player_id
+        return joined + 1
+
+    player_id = rng.choice(ids)
+
+    if action == "leave":
+        room.remove_player(sockets.pop(player_id))
+    elif action == "ready":
+        room.set_ready(player_id)
+    elif action == "unready":
+        room.unready(player_id)
+    elif action == "turn":
+        room.start_turn(player_id)
+        room.end_turn(player_id)
+    elif action == "vote":
+        room.vote(player_id, rng.choice(ids))
+    elif action == "round":
+        room.next_round()
+    elif action == "reset":
+        room.reset_room()
+        room.impostor = rng.choice(ids)
+
+    return joined
+
+async def play(seed: int):
+    rng = random.Random(seed)
+    room = GameRoom(f"check-{seed}")
+    sockets = {}
+    joined = 0
+
+    for step in range(STEPS):
+        joined = random_step(room, rng, sockets, joined)
+        assert incremental(room) == brute_force(room), f"step {step}"
+
+    for websocket in list(room.connections):
+        room.remove_player(websocket)
+
+@pytest.mark.parametrize("seed", range(SEEDS))
+def test_counters_match_brute_force(seed: int):
+    # Each connection's outbound queue starts a writer task, so the room needs a running loop
+    asyncio.run(play(seed))